@@ -1957,16 +1957,18 @@ def initialise_agentic_state() -> Dict[str, Any]:
     }
 
 
+_CONFIRM_RE = re.compile(r"confirm|looks good|proceed|go ahead|approved", re.IGNORECASE)
+_PUSH_RE = re.compile(r"push|commit|publish|merge|deploy", re.IGNORECASE)
+_FEEDBACK_RE = re.compile(r"feedback|change|modify|update|adjust|revise", re.IGNORECASE)
+
+
 def interpret_confirmation(text: str) -> bool:
-    lowered = text.lower()
-    return any(keyword in lowered for keyword in ["confirm", "looks good", "proceed", "go ahead", "approved"])
+    return _CONFIRM_RE.search(text) is not None
 
 
 def interpret_push(text: str) -> bool:
-    lowered = text.lower()
-    return any(keyword in lowered for keyword in ["push", "commit", "publish", "merge", "deploy"])
+    return _PUSH_RE.search(text) is not None
 
 
 def interpret_feedback(text: str) -> bool:
-    lowered = text.lower()
-    return any(keyword in lowered for keyword in ["feedback", "change", "modify", "update", "adjust", "revise"])
+    return _FEEDBACK_RE.search(text) is not None
@@ -89,6 +89,10 @@ class RecorderEventPayload(BaseModel):
     details: Dict[str, Any] | None = Field(None, description="Optional structured payload.")
 
 
+class RecorderEventBatchPayload(BaseModel):
+    events: List[RecorderEventPayload] = Field(default_factory=list, description="Events in emission order.")
+
+
 class TestCaseRequest(BaseModel):
     story: str = Field(..., description="Jira story / scenario description.")
     llmOnly: bool = Field(False, description="Skip deterministic injection when true.")
@@ -208,6 +212,7 @@ async def finalize_recorder(req: FinalizeRecorderRequest) -> RecorderSessionResp
         raise HTTPException(status_code=404, detail=f"Session directory not found: {session_dir}")
 
     result = finalize_recorder_session(session_dir)
+    r_vector.invalidate_caches()
     session_id = _session_identifier(session_dir)
     await recorder_events.publish(
         session_id,
@@ -235,6 +240,7 @@ async def finalize_recorder_by_session(req: dict) -> dict:
     def background_finalize():
         try:
             result = finalize_recorder_session(session_dir)
+            r_vector.invalidate_caches()
             print(f"[Finalize] Session {session_id} finalized successfully")
             print(f"[Finalize] Auto-ingest status: {result.auto_ingest_status}")
         except Exception as e:
@@ -280,6 +286,13 @@ async def publish_recorder_event(session_id: str, payload: RecorderEventPayload)
     return {"status": "queued"}
 
 
+@app.post("/api/recorder/{session_id}/events:batch", status_code=202)
+async def publish_recorder_event_batch(session_id: str, payload: RecorderEventBatchPayload) -> Dict[str, Any]:
+    for event in payload.events:
+        await recorder_events.publish(session_id, event.model_dump())
+    return {"status": "queued", "count": len(payload.events)}
+
+
 @app.websocket("/ws/recorder/{session_id}")
 async def recorder_event_stream(websocket: WebSocket, session_id: str) -> None:
     await websocket.accept()
@@ -392,6 +405,7 @@ async def delete_vector_doc_sync(doc_id: str) -> dict:
     # URL decode the doc_id to handle encoded characters like %3A (colon) and %2F (slash)
     decoded_doc_id = unquote(doc_id)
     client.delete_document(decoded_doc_id)
+    r_vector.invalidate_caches()
     return {"deleted": decoded_doc_id, "status": "success"}
 
 
@@ -407,6 +421,7 @@ async def delete_vector_by_source_sync(source: str) -> dict:
     from app.vector_db import VectorDBClient
     client = VectorDBClient()
     client.delete_by_source(source)
+    r_vector.invalidate_caches()
     return {"deletedSource": source, "status": "success"}
 
 
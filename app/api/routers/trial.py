@@ -90,6 +90,15 @@ async def run(req: TrialRunRequest) -> Dict[str, Any]:
                 pass
 
 
+@router.post("/playwright-cache/clear")
+async def clear_playwright_cache() -> Dict[str, str]:
+    """Forget cached Playwright CLI resolutions (e.g. after installing Node or npm ci)."""
+    from ...executor import _resolve_playwright_base
+
+    _resolve_playwright_base.cache_clear()
+    return {"status": "cleared"}
+
+
 @router.get("/stream")
 async def stream(spec: str, headed: bool = True, frameworkRoot: Optional[str] = None, scenario: Optional[str] = None) -> StreamingResponse:
     repo_root = Path(frameworkRoot).resolve() if frameworkRoot else resolve_framework_root()
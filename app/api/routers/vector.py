@@ -1,14 +1,38 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+import hashlib
+import json
+import time
+from typing import Any, Dict, List, Optional, Tuple
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 import os
 from pydantic import BaseModel
 
 
 router = APIRouter(prefix="/vector", tags=["vector"])
 
+# Short-lived response caches for endpoints the recorder UI polls back-to-back.
+_FLOWS_CACHE_TTL = float(os.getenv("VECTOR_FLOWS_CACHE_TTL", "5"))
+# Query caching is opt-in: set VECTOR_QUERY_CACHE_TTL (seconds) to enable.
+_QUERY_CACHE_TTL = float(os.getenv("VECTOR_QUERY_CACHE_TTL", "0"))
+_QUERY_CACHE_MAX = 256
+# Entries also record vector_db.store_version() at compute time, so any write
+# (ingest, delete; from this process or a worker) invalidates them.
+_flows_cache: Dict[str, Tuple[float, Tuple[int, ...], Dict[str, Any], str]] = {}
+_query_cache: Dict[str, Tuple[float, Tuple[int, ...], Dict[str, Any]]] = {}
+
+
+def invalidate_caches() -> None:
+    """Drop cached flow listings and query results (call after ingest/delete)."""
+    _flows_cache.clear()
+    _query_cache.clear()
+
+
+def _cache_key(*parts: Any) -> str:
+    raw = json.dumps(parts, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
 
 class VectorQueryRequest(BaseModel):
     query: str
@@ -29,12 +53,23 @@ class VectorQueryResponse(BaseModel):
 @router.post("/query", response_model=VectorQueryResponse)
 async def query(req: VectorQueryRequest) -> VectorQueryResponse:
     try:
-        from ...vector_db import VectorDBClient
+        from ... import vector_db
     except Exception as exc:  # pragma: no cover
         raise HTTPException(status_code=500, detail=f"Import failure: {exc}") from exc
 
-    client = VectorDBClient(path=os.getenv("VECTOR_DB_PATH", "./vector_store"))  # type: ignore[name-defined]
-    # The above uses os from the global scope if available; fallback to default path if not.
+    db_path = os.getenv("VECTOR_DB_PATH", "./vector_store")
+    cache_key = ""
+    version: Tuple[int, ...] = ()
+    if _QUERY_CACHE_TTL > 0:
+        # Normalise whitespace/case so trivially different queries share an entry.
+        normalised = " ".join((req.query or "").lower().split())
+        cache_key = _cache_key(normalised, max(1, req.topK), req.where or None)
+        version = vector_db.store_version(db_path)
+        hit = _query_cache.get(cache_key)
+        if hit and hit[1] == version and time.monotonic() - hit[0] < _QUERY_CACHE_TTL:
+            return VectorQueryResponse(**hit[2])
+
+    client = vector_db.VectorDBClient(path=db_path)
     try:
         top_k = max(1, req.topK)
         query_str = (req.query or "").strip()
@@ -66,7 +101,12 @@ async def query(req: VectorQueryRequest) -> VectorQueryResponse:
                 metadata=item.get("metadata") or {},
             )
         )
-    return VectorQueryResponse(results=records)
+    response = VectorQueryResponse(results=records)
+    if cache_key:
+        if len(_query_cache) >= _QUERY_CACHE_MAX:
+            _query_cache.pop(next(iter(_query_cache)))
+        _query_cache[cache_key] = (time.monotonic(), version, response.model_dump())
+    return response
 
 
 class FlowListItem(BaseModel):
@@ -81,8 +121,40 @@ class FlowListResponse(BaseModel):
 
 
 @router.get("/flows", response_model=FlowListResponse)
-async def list_flows() -> FlowListResponse:
-    """List all refined recorder flows from the vector database."""
+async def list_flows(request: Request, response: Response) -> Any:
+    """List all refined recorder flows from the vector database.
+
+    Responses are cached for a few seconds (until the store changes) and
+    tagged with an ETag; clients must revalidate every time (no-cache) and get
+    304 Not Modified while the list is unchanged.
+    """
+    try:
+        from ... import vector_db
+    except Exception as exc:  # pragma: no cover
+        raise HTTPException(status_code=500, detail=f"Import failure: {exc}") from exc
+
+    where = {"type": "recorder_refined"}
+    key = _cache_key(where)
+    version = vector_db.store_version(os.getenv("VECTOR_DB_PATH", "./vector_store"))
+    cached = _flows_cache.get(key)
+    if cached and cached[1] == version and time.monotonic() - cached[0] < _FLOWS_CACHE_TTL:
+        payload, etag = cached[2], cached[3]
+    else:
+        payload = _compute_flow_list(where).model_dump()
+        etag = '"' + _cache_key(payload) + '"'
+        _flows_cache[key] = (time.monotonic(), version, payload, etag)
+
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "no-cache",
+    }
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return payload
+
+
+def _compute_flow_list(where: Dict[str, Any]) -> FlowListResponse:
     try:
         from ...vector_db import VectorDBClient
     except Exception as exc:
@@ -91,29 +163,33 @@ async def list_flows() -> FlowListResponse:
     client = VectorDBClient(path=os.getenv("VECTOR_DB_PATH", "./vector_store"))
     
     try:
-        # Query for all recorder_refined documents
-        raw = client.get_where(where={"type": "recorder_refined"}, limit=1000)
+        # Only metadatas are fetched (document bodies are skipped), grouped per flow.
+        grouped = client.distinct_metadata(
+            where=where,
+            keys=("flow_slug", "flow_name"),
+            aggregates={"count": "*", "latest": "max(timestamp)", "ingested": "max(ingested_at)"},
+        )
     except Exception as exc:
         raise HTTPException(status_code=500, detail=f"Vector query failed: {exc}") from exc
 
-    # Group by flow_slug to get unique flows
+    # Merge groups that share a slug but differ in flow_name; a flow's
+    # timestamp is the newest one across its documents
     flows_map: Dict[str, Dict[str, Any]] = {}
-    for item in raw or []:
-        metadata = item.get("metadata") or {}
-        flow_slug = metadata.get("flow_slug")
-        if not flow_slug:
-            continue
-        
-        if flow_slug not in flows_map:
+    for group in grouped:
+        flow_slug = group["flow_slug"]
+        latest = group["latest"] or group["ingested"]
+        entry = flows_map.get(flow_slug)
+        if entry is None:
             flows_map[flow_slug] = {
-                "flowName": metadata.get("flow_name") or flow_slug,
+                "flowName": group["flow_name"] or flow_slug,
                 "flowSlug": flow_slug,
-                "timestamp": metadata.get("timestamp") or metadata.get("ingested_at"),
-                "stepCount": 0
+                "timestamp": latest,
+                "stepCount": group["count"],
             }
-        
-        # Count steps
-        flows_map[flow_slug]["stepCount"] += 1
+            continue
+        entry["stepCount"] += group["count"]
+        if latest and str(latest) > str(entry["timestamp"] or ""):
+            entry["timestamp"] = latest
 
     # Convert to list and sort by timestamp (newest first)
     flows = list(flows_map.values())
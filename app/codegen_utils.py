@@ -2,23 +2,19 @@
 
 from typing import Dict, List
 
+DEFAULT_IMPORT = "import { test, expect } from '@playwright/test';"
+
+
 def generate_final_script(test_name, structure):
     if isinstance(structure, str):
         structure = {
-            "imports": ["import { test, expect } from '@playwright/test';"],
+            "imports": [DEFAULT_IMPORT],
             "steps": structure.splitlines()
         }
 
-    imports = "\n".join(structure.get("imports", ["import { test, expect } from '@playwright/test';"]))
-    steps = "\n".join([f"    // {s}" for s in structure.get("steps", [])])
-
-    script = f"""
-{imports}
-
-test('{test_name}', async ({{
-    page
-}}) => {{
-{steps}
-}});
-"""
-    return script
+    # Build the script from a single fragment list joined once.
+    parts: List[str] = ["\n".join(structure.get("imports", (DEFAULT_IMPORT,)))]
+    parts.append(f"\n\ntest('{test_name}', async ({{\n    page\n}}) => {{\n")
+    parts.append("\n".join(f"    // {s}" for s in structure.get("steps", ())))
+    parts.append("\n});\n")
+    return "".join(parts)
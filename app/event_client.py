@@ -1,28 +1,130 @@
-"""Client helper to publish recorder events to the FastAPI backend."""
+"""Client helper to publish recorder events to the FastAPI backend.
+
+Events are queued in-process and flushed by a daemon thread in small batches so
+that a recording session emitting hundreds of updates does not pay one HTTP
+round-trip per event.
+"""
 
 from __future__ import annotations
 
+import atexit
 import os
-from typing import Any, Dict
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
 
 import requests
 
 
 BACKEND_BASE_URL = os.getenv("BACKEND_BASE_URL", "http://localhost:8001")
 
+_BATCH_MAX_EVENTS = 64
+_BATCH_MAX_WAIT = 0.1
+
+_QUEUE: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+# Queued at exit: the flusher posts everything ahead of it, then returns.
+_STOP = object()
+_SESSION = requests.Session()
+_flusher: Optional[threading.Thread] = None
+_flusher_lock = threading.Lock()
+
+
+def _post_batch(session_id: str, events: List[Dict[str, Any]]) -> None:
+    url = f"{BACKEND_BASE_URL.rstrip('/')}/api/recorder/{session_id}/events:batch"
+    try:
+        _SESSION.post(url, json={"events": events}, timeout=2)
+    except requests.RequestException:
+        # Backend may not be running yet during local dev; fail silently.
+        return
+
+
+def _drain(first: Optional[Tuple[str, Dict[str, Any]]] = None) -> bool:
+    """Collect up to one batch from the queue and post it grouped by session.
+
+    Returns True when the stop marker was taken off the queue; the batch
+    collected so far is still posted.
+    """
+
+    stopped = False
+    batches: Dict[str, List[Dict[str, Any]]] = {}
+    last_seen: Dict[str, Tuple[str, str]] = {}
+    item = first
+    deadline = time.monotonic() + _BATCH_MAX_WAIT
+    count = 0
+    while True:
+        if item is _STOP:
+            stopped = True
+            break
+        if item is not None:
+            session_id, payload = item
+            key = (payload.get("message", ""), payload.get("level", ""))
+            # Drop back-to-back duplicates (same message and level) per session.
+            if last_seen.get(session_id) != key:
+                batches.setdefault(session_id, []).append(payload)
+                last_seen[session_id] = key
+            count += 1
+            if count >= _BATCH_MAX_EVENTS:
+                break
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            item = _QUEUE.get(timeout=remaining)
+        except queue.Empty:
+            break
+    for session_id, events in batches.items():
+        _post_batch(session_id, events)
+    return stopped
+
+
+def _flush_loop() -> None:
+    while not _drain(_QUEUE.get()):
+        pass
+
+
+def _ensure_flusher() -> None:
+    global _flusher
+    if _flusher is not None:
+        return
+    with _flusher_lock:
+        if _flusher is None:
+            _flusher = threading.Thread(target=_flush_loop, name="recorder-event-flusher", daemon=True)
+            _flusher.start()
+
+
+def flush_recorder_events(timeout: float = 5.0) -> None:
+    """Stop the flusher and send any events still queued (used at interpreter exit).
+
+    The flusher may be holding the last events in its batch window, so the
+    queue being empty proves nothing; wait for it to post them and exit.
+    """
+
+    global _flusher
+    with _flusher_lock:
+        flusher, _flusher = _flusher, None
+    if flusher is not None and flusher.is_alive():
+        _QUEUE.put(_STOP)
+        flusher.join(timeout)
+    while True:
+        try:
+            item = _QUEUE.get_nowait()
+        except queue.Empty:
+            return
+        if item is not _STOP:
+            _drain(item)
+
+
+atexit.register(flush_recorder_events)
+
 
 def publish_recorder_event(session_id: str, message: str, level: str = "info", **details: Any) -> None:
-    """Send a recorder event to the backend event stream, ignoring network failures."""
+    """Queue a recorder event for the backend event stream; delivery is best-effort."""
 
     if not session_id:
         return
-    url = f"{BACKEND_BASE_URL.rstrip('/')}/api/recorder/{session_id}/events"
     payload: Dict[str, Any] = {"message": message, "level": level}
     if details:
         payload["details"] = details
-    try:
-        requests.post(url, json=payload, timeout=2)
-    except requests.RequestException:
-        # Backend may not be running yet during local dev; fail silently.
-        return
-
+    _ensure_flusher()
+    _QUEUE.put_nowait((session_id, payload))
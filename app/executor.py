@@ -5,59 +5,72 @@ import os
 import sys
 import shutil
 import re
+import functools
 from pathlib import Path
 from typing import Tuple, List, Optional, Dict
 
-def _resolve_playwright_command(tmp_path: str, headed: bool, project_root: Optional[Path] = None) -> Tuple[List[str], str]:
-    """Resolve a runnable Playwright CLI invocation across Windows/Linux.
+@functools.lru_cache(maxsize=8)
+def _resolve_playwright_base(project_root: str) -> Tuple[Tuple[str, ...], str]:
+    """Resolve (and cache) the Playwright CLI argv prefix for a project root.
 
-    Parameters:
-        tmp_path: Path to spec file (absolute or relative to project_root).
-        headed: Whether to append --headed.
-        project_root: Root where Playwright config & node_modules live. Defaults to monorepo root.
+    The PATH walk and node_modules probing only depend on the project root, so the
+    result is cached; call ``_resolve_playwright_base.cache_clear()`` after
+    installing Node/Playwright to pick up changes.
     """
     # Add Node.js to PATH first so shutil.which can find it
     nodejs_path = r"C:\Program Files\nodejs"
     if nodejs_path not in os.environ.get("PATH", ""):
         os.environ["PATH"] = nodejs_path + os.pathsep + os.environ.get("PATH", "")
-    
-    project_root = project_root or Path(__file__).resolve().parents[2]
-    cwd = str(project_root)
 
-    # Playwright treats positional args as regex. On Windows, backslashes can break the match.
-    # Normalize to forward slashes so the regex matches the file path reliably.
-    arg_path = tmp_path.replace("\\", "/")
-    # base_args = ["test", arg_path, "--reporter=line"]
-    base_args = ["test", arg_path,]
-    if headed:
-        base_args.append("--headed")
+    root = Path(project_root)
 
     # Prefer npx if available on PATH
     npx_path = shutil.which("npx") or shutil.which("npx.cmd")
     if npx_path:
-        return [npx_path, "playwright", *base_args], cwd
+        return (npx_path, "playwright"), project_root
 
     # Fallback to node_modules binaries
-    bin_dir_win = project_root / "node_modules" / ".bin" / "playwright.cmd"
-    bin_dir_unix = project_root / "node_modules" / ".bin" / "playwright"
+    bin_dir_win = root / "node_modules" / ".bin" / "playwright.cmd"
+    bin_dir_unix = root / "node_modules" / ".bin" / "playwright"
     if bin_dir_win.exists():
-        return [str(bin_dir_win), *base_args], cwd
+        return (str(bin_dir_win),), project_root
     if bin_dir_unix.exists():
-        return [str(bin_dir_unix), *base_args], cwd
+        return (str(bin_dir_unix),), project_root
 
     # Fallback to running the CLI JS directly
-    cli_js = project_root / "node_modules" / "@playwright" / "test" / "cli.js"
+    cli_js = root / "node_modules" / "@playwright" / "test" / "cli.js"
     node_path = shutil.which("node") or shutil.which("node.exe")
     if node_path and cli_js.exists():
-        return [node_path, str(cli_js), *base_args], cwd
+        return (node_path, str(cli_js)), project_root
 
-    # Nothing found; craft helpful error
+    # Nothing found; craft helpful error (not cached by lru_cache)
     raise FileNotFoundError(
         "Playwright CLI not found. Ensure Node and @playwright/test are installed (npm ci) "
         "and that npx is on PATH."
     )
 
 
+def _resolve_playwright_command(tmp_path: str, headed: bool, project_root: Optional[Path] = None) -> Tuple[List[str], str]:
+    """Resolve a runnable Playwright CLI invocation across Windows/Linux.
+
+    Parameters:
+        tmp_path: Path to spec file (absolute or relative to project_root).
+        headed: Whether to append --headed.
+        project_root: Root where Playwright config & node_modules live. Defaults to monorepo root.
+    """
+    project_root = project_root or Path(__file__).resolve().parents[2]
+    prefix, cwd = _resolve_playwright_base(str(project_root))
+
+    # Playwright treats positional args as regex. On Windows, backslashes can break the match.
+    # Normalize to forward slashes so the regex matches the file path reliably.
+    arg_path = tmp_path.replace("\\", "/")
+    # base_args = ["test", arg_path, "--reporter=line"]
+    base_args = ["test", arg_path,]
+    if headed:
+        base_args.append("--headed")
+    return [*prefix, *base_args], cwd
+
+
 def run_trial(script_content: str, headed: bool = True, env_overrides: Optional[Dict[str, str]] = None) -> Tuple[bool, str]:
     """Write script to a temp file and execute it via Playwright.
 
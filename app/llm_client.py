@@ -1,6 +1,8 @@
 # llm_client.py
+import asyncio
 import os
 import json
+import random
 
 # Optional import: defer hard dependency to runtime to avoid import-time 500s
 try:  # pragma: no cover - guarded import
@@ -8,18 +10,43 @@ try:  # pragma: no cover - guarded import
 except ImportError:  # pragma: no cover
     AzureChatOpenAI = None  # type: ignore
 
+try:  # pragma: no cover - guarded import
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
 CACHE_FILE = "./locator_cache.json"
 
 # -------------------- Locator Cache --------------------
+# (mtime_ns, parsed cache) of the last read; disk is re-read only when the file changes.
+_cache_snapshot = None
+
+
 def load_locator_cache():
-    if os.path.exists(CACHE_FILE):
-        with open(CACHE_FILE, "r") as f:
-            return json.load(f)
-    return {}
+    global _cache_snapshot
+    try:
+        mtime = os.stat(CACHE_FILE).st_mtime_ns
+    except OSError:
+        return {}
+    if _cache_snapshot is not None and _cache_snapshot[0] == mtime:
+        return dict(_cache_snapshot[1])
+    with open(CACHE_FILE, "rb") as f:
+        raw = f.read()
+    data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    _cache_snapshot = (mtime, data)
+    return dict(data)
 
 def save_locator_cache(cache):
-    with open(CACHE_FILE, "w") as f:
-        json.dump(cache, f, indent=2)
+    global _cache_snapshot
+    tmp_path = CACHE_FILE + ".tmp"
+    if orjson is not None:
+        payload = orjson.dumps(cache, option=orjson.OPT_INDENT_2)
+    else:
+        payload = json.dumps(cache, indent=2).encode("utf-8")
+    with open(tmp_path, "wb") as f:
+        f.write(payload)
+    os.replace(tmp_path, CACHE_FILE)
+    _cache_snapshot = None
 
 # def update_locator_cache(old_locator, new_locator):
 #     cache = load_locator_cache()
@@ -56,8 +83,8 @@ def _ensure_llm():
     return _llm_instance
 
 # -------------------- Generate Script --------------------
-def ask_llm_for_script(structure, existing_script, test_case, enriched_steps, ui_crawl, framework_prompt):
-    prompt = f"""
+def _script_prompt(structure, existing_script, test_case, enriched_steps, ui_crawl, framework_prompt):
+    return f"""
 {framework_prompt}
 
 Rules:
@@ -84,12 +111,20 @@ Enriched Steps (each may include a 'locators' object with 'playwright', 'xpath',
 UI Crawl Data:
 {ui_crawl or "N/A"}
 """
+
+
+def _response_text(resp):
+    return resp.content.strip() if hasattr(resp, "content") else str(resp)
+
+
+def ask_llm_for_script(structure, existing_script, test_case, enriched_steps, ui_crawl, framework_prompt):
+    prompt = _script_prompt(structure, existing_script, test_case, enriched_steps, ui_crawl, framework_prompt)
     llm = _ensure_llm()
     resp = llm.invoke(prompt)
-    return resp.content.strip() if hasattr(resp, "content") else str(resp)
+    return _response_text(resp)
 # -------------------- Self-Healing --------------------
-def ask_llm_to_self_heal(failed_script, logs, ui_crawl):
-    prompt = f"""
+def _self_heal_prompt(failed_script, logs, ui_crawl):
+    return f"""
 You are debugging a Playwright TypeScript script.
 
 Failing Script:
@@ -108,6 +143,57 @@ Task:
 - Update the locator cache with old→new mappings.
 - Return the full corrected TypeScript script only.
     """
+
+
+def ask_llm_to_self_heal(failed_script, logs, ui_crawl):
+    prompt = _self_heal_prompt(failed_script, logs, ui_crawl)
     llm = _ensure_llm()
     resp = llm.invoke(prompt)
-    return resp.content.strip() if hasattr(resp, "content") else str(resp)
+    return _response_text(resp)
+
+# -------------------- Concurrent batches --------------------
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+LLM_MAX_RETRIES = 5
+
+
+def _is_rate_limited(exc):
+    status = getattr(exc, "status_code", None) or getattr(getattr(exc, "response", None), "status_code", None)
+    return status == 429 or type(exc).__name__ == "RateLimitError"
+
+
+async def _ainvoke_bounded(llm, prompt, semaphore):
+    for attempt in range(LLM_MAX_RETRIES):
+        try:
+            # Hold a slot only for the request itself, so a rate-limited
+            # prompt backing off does not block the others
+            async with semaphore:
+                resp = await llm.ainvoke(prompt)
+            return _response_text(resp)
+        except Exception as exc:
+            if not _is_rate_limited(exc) or attempt == LLM_MAX_RETRIES - 1:
+                raise
+        # Full-jitter exponential backoff on 429s
+        await asyncio.sleep(random.uniform(0, min(30.0, 2 ** attempt)))
+
+
+async def ainvoke_many(prompts, max_concurrency=None):
+    """Invoke the LLM for each prompt concurrently, preserving input order."""
+    llm = _ensure_llm()
+    semaphore = asyncio.Semaphore(max_concurrency or LLM_MAX_CONCURRENCY)
+    return await asyncio.gather(*(_ainvoke_bounded(llm, p, semaphore) for p in prompts))
+
+
+def ask_llm_for_script_many(requests, max_concurrency=None):
+    """Generate scripts for many test cases concurrently.
+
+    Each item in `requests` is a dict of ask_llm_for_script keyword arguments.
+    Must be called from synchronous code; async callers should await ainvoke_many.
+    """
+    prompts = [_script_prompt(**req) for req in requests]
+    return asyncio.run(ainvoke_many(prompts, max_concurrency))
+
+
+def ask_llm_to_self_heal_many(requests, max_concurrency=None):
+    """Self-heal many failing scripts concurrently (dicts of ask_llm_to_self_heal kwargs)."""
+    prompts = [_self_heal_prompt(**req) for req in requests]
+    return asyncio.run(ainvoke_many(prompts, max_concurrency))
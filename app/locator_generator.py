@@ -1,3 +1,4 @@
+import functools
 import re
 from typing import List
 
@@ -19,18 +20,15 @@ def _extract_role_and_name(s: str) -> tuple[str | None, str | None]:
     return role, name
 
 
+@functools.lru_cache(maxsize=2048)
 def _escape(text: str) -> str:
     # Simple XPath string literal escape that handles quotes by using concat if needed
     if "'" not in text:
         return f"'{text}'"
     if '"' not in text:
         return f'"{text}"'
-    parts = []
-    for part in text.split("'"):
-        parts.append(f"'{part}'")
-        parts.append('"' + "'" + '"')
-    parts.pop()  # remove last added quote concat
-    return "concat(" + ", ".join(parts) + ")"
+    # Mixed quotes: single-quoted segments joined by a double-quoted apostrophe
+    return "concat(" + ", \"'\", ".join(f"'{part}'" for part in text.split("'")) + ")"
 
 
 def generate_xpath_candidates(selector_expr: str) -> List[str]:
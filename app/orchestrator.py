@@ -1,10 +1,35 @@
 """Script orchestration that prefers local Playwright recordings over deprecated saved_flows."""
 import json
+import os
 import re
+import string
+import time
+from collections import OrderedDict
 from pathlib import Path
 
 from app.vector_db import VectorDBClient
 
+try:  # pragma: no cover - optional streaming parser (C backend when available)
+    import ijson  # type: ignore
+except ImportError:  # pragma: no cover
+    ijson = None  # type: ignore
+
+try:  # pragma: no cover - optional fast JSON
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+_NON_ALNUM = re.compile(r"[^a-zA-Z0-9]")
+_KEEP = set(string.ascii_lowercase + string.digits)
+_TRANS = str.maketrans("", "", "".join(chr(c) for c in range(256) if chr(c) not in _KEEP))
+
+
+def _alnum_key(value: str) -> str:
+    """Lowercase ``value`` and strip everything but ASCII letters and digits."""
+    key = value.lower().translate(_TRANS)
+    # The table only covers Latin-1; anything wider falls back to the regex.
+    return key if key.isascii() else _NON_ALNUM.sub("", key)
+
 try:
     from .parser_utils import (
         extract_structure,
@@ -43,8 +68,29 @@ def safe_content(artifact):
 
 
 class TestScriptOrchestrator:
+    # Seconds a vector lookup for the same test case id is reused, as long as
+    # the store has not been written to (ingest/delete) in the meantime.
+    QUERY_CACHE_TTL = 60.0
+    QUERY_CACHE_MAX = 256
+
     def __init__(self, db_path="./vector_store"):
         self.db = VectorDBClient(path=db_path)
+        self._query_cache = OrderedDict()
+
+    def _cached_query(self, test_case_id: str, top_k: int):
+        key = (test_case_id, top_k)
+        now = time.monotonic()
+        version = self.db.store_version()
+        hit = self._query_cache.get(key)
+        if hit is not None and hit[1] == version and now - hit[0] < self.QUERY_CACHE_TTL:
+            self._query_cache.move_to_end(key)
+            return hit[2]
+        results = self.db.query(test_case_id, top_k=top_k)
+        self._query_cache[key] = (now, version, results)
+        self._query_cache.move_to_end(key)
+        if len(self._query_cache) > self.QUERY_CACHE_MAX:
+            self._query_cache.popitem(last=False)
+        return results
 
     def _load_local_recorder_flow(self, identifier: str):
         """Load newest recording metadata and convert to a simple steps JSON.
@@ -56,30 +102,52 @@ class TestScriptOrchestrator:
         if not rec_dir.exists():
             return None
 
-        key = re.sub(r"[^a-zA-Z0-9]", "", (identifier or "").lower())
-        # Newest sessions first by metadata.json mtime
+        key = _alnum_key(identifier or "")
+        # One scandir pass: filter by session name before touching metadata.json,
+        # then a single stat per remaining session for its mtime.
         candidates = []
-        for sess in rec_dir.iterdir():
-            if not sess.is_dir():
-                continue
-            meta = sess / "metadata.json"
-            if meta.exists():
+        with os.scandir(rec_dir) as entries:
+            for entry in entries:
+                # Name check first: it is free, while is_dir() may need a stat.
+                if key and key not in _alnum_key(entry.name):
+                    continue
+                if not entry.is_dir():
+                    continue
+                meta_path = os.path.join(entry.path, "metadata.json")
                 try:
-                    mtime = meta.stat().st_mtime
-                except Exception:
-                    mtime = 0
-                candidates.append((mtime, sess.name, meta))
-        candidates.sort(key=lambda t: t[0], reverse=True)
+                    mtime = os.stat(meta_path).st_mtime
+                except OSError:
+                    continue
+                candidates.append((mtime, entry.name, Path(meta_path)))
         if not candidates:
             return None
 
+        def newest_first():
+            # The newest session almost always has steps; only sort when it doesn't.
+            newest = max(candidates, key=lambda t: t[0])
+            yield newest
+            rest = [c for c in candidates if c is not newest]
+            rest.sort(key=lambda t: t[0], reverse=True)
+            yield from rest
+
+        def iter_actions(fh):
+            # Stream actions one at a time; other metadata sections are never materialised.
+            if ijson is not None:
+                return ijson.items(fh, "actions.item", use_float=True)
+            raw = fh.read()
+            data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+            return iter(data.get("actions", []))
+
         def to_steps(meta_path: Path):
             try:
-                data = json.loads(meta_path.read_text(encoding="utf-8"))
+                with meta_path.open("rb") as fh:
+                    return actions_to_steps(iter_actions(fh))
             except Exception:
                 return []
+
+        def actions_to_steps(actions):
             steps = []
-            for act in data.get("actions", []):
+            for act in actions:
                 action = (act.get("action") or act.get("type") or "").lower()
                 if not action:
                     continue
@@ -100,28 +168,24 @@ class TestScriptOrchestrator:
                 steps.append(entry)
             return steps
 
-        for _mtime, sess_name, meta in candidates:
+        for _mtime, sess_name, meta in newest_first():
             steps = to_steps(meta)
             if not steps:
                 continue
-            content = json.dumps({"steps": steps}, ensure_ascii=False)
-            context = {
-                "content": content,
+            # Hand the parsed steps straight to parser_utils; no JSON round-trip.
+            return {
+                "content": {"steps": steps},
                 "metadata": {
                     "source": "playwright-local",
                     "flow_name": sess_name,
                     "type": "recorder",
                 },
             }
-            normalized_name = re.sub(r"[^a-zA-Z0-9]", "", sess_name.lower())
-            if key and key not in normalized_name:
-                continue
-            return context
         return None
 
     def generate_script(self, test_case_id: str):
         # 1️⃣ Fetch relevant artifacts
-        results = self.db.query(test_case_id, top_k=10)
+        results = self._cached_query(test_case_id, 10)
 
         # 2️⃣ Normalize results to a list of docs
         if isinstance(results, dict):
@@ -156,10 +220,13 @@ class TestScriptOrchestrator:
             })
 
         # 4️⃣ Extract key artifacts
-        existing_script = next((a for a in artifacts if a["metadata"].get("type") == "script"), None)
-        recorder_flow   = next((a for a in artifacts if a["metadata"].get("type") == "recorder"), None)
-        ui_crawl        = next((a for a in artifacts if a["metadata"].get("type") == "ui_crawl"), None)
-        test_case       = next((a for a in artifacts if a["metadata"].get("type") == "test_case"), None)
+        by_type = {}
+        for a in artifacts:
+            by_type.setdefault(a["metadata"].get("type"), a)
+        existing_script = by_type.get("script")
+        recorder_flow   = by_type.get("recorder")
+        ui_crawl        = by_type.get("ui_crawl")
+        test_case       = by_type.get("test_case")
 
         if not recorder_flow:
             local_flow = self._load_local_recorder_flow(test_case_id)
@@ -1,12 +1,27 @@
 # parser_utils.py
 import re
 import json
+from itertools import chain
+
+try:  # pragma: no cover - optional fast JSON
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+_IMPORT_RE = re.compile(r"^import .*;", re.MULTILINE)
+_DESCRIBE_RE = re.compile(r'describe\((.*?)\)')
+
+def _load(payload):
+    """Accept an already-parsed dict (from the orchestrator) or a JSON string."""
+    if isinstance(payload, dict):
+        return payload
+    return orjson.loads(payload) if orjson is not None else json.loads(payload)
 
 def extract_structure(script_content: str):
     """Extract test suite structure (imports, describe blocks, hooks)."""
     structure = {
-        "imports": re.findall(r"^import .*;", script_content, re.MULTILINE),
-        "describe": re.findall(r'describe\((.*?)\)', script_content),
+        "imports": _IMPORT_RE.findall(script_content),
+        "describe": _DESCRIBE_RE.findall(script_content),
         "hooks": {
             "beforeAll": "beforeAll(async () => {});",
             "afterAll": "afterAll(async () => {});"
@@ -14,12 +29,12 @@ def extract_structure(script_content: str):
     }
     return structure
 
-def merge_recorder_flow(structure, recorder_json: str):
+def merge_recorder_flow(structure, recorder_json):
     """Merge recorder flow steps into script structure.
 
-    Expects a JSON with shape {"steps": [{"action": "click|fill|press", "selector": "...", ...}]}.
+    Expects a dict (or JSON string) with shape {"steps": [{"action": "click|fill|press", "selector": "...", ...}]}.
     """
-    flow = json.loads(recorder_json)
+    flow = _load(recorder_json)
     steps = []
     for step in flow.get("steps", []):
         action = step.get("action")
@@ -35,23 +50,24 @@ def merge_recorder_flow(structure, recorder_json: str):
             steps.append(f'await page.click("{selector}");')
     return steps
 
-def apply_ui_crawl_locators(steps, ui_crawl_json: str):
-    """Self-heal locators using UI crawl data."""
-    crawl = json.loads(ui_crawl_json)
-    healed_steps = []
-    for step in steps:
-        for element in crawl.get("elements", []):
-            if element["old_locator"] in step:
-                step = step.replace(element["old_locator"], element["new_locator"])
-        healed_steps.append(step)
-    return healed_steps
-
-def insert_test_variations(steps, test_case_json: str):
-    """Expand recorder steps with happy/negative/edge cases."""
-    cases = json.loads(test_case_json)
-    enriched = []
-    for case in cases.get("scenarios", []):
-        enriched.append(f'// {case["type"].upper()} CASE: {case["description"]}')
-        for step in steps:
-            enriched.append(step)
-    return enriched
+def apply_ui_crawl_locators(steps, ui_crawl_json):
+    """Self-heal locators using UI crawl data (dict or JSON string)."""
+    crawl = _load(ui_crawl_json)
+    mapping = {}
+    for element in crawl.get("elements", []):
+        mapping.setdefault(element["old_locator"], element["new_locator"])
+    mapping.pop("", None)
+    if not mapping:
+        return list(steps)
+    # One alternation scan per step; longest locators first so overlaps prefer the most specific.
+    pattern = re.compile("|".join(re.escape(k) for k in sorted(mapping, key=len, reverse=True)))
+    return [pattern.sub(lambda m: mapping[m.group(0)], step) for step in steps]
+
+def insert_test_variations(steps, test_case_json):
+    """Expand recorder steps with happy/negative/edge cases (dict or JSON string)."""
+    cases = _load(test_case_json)
+    steps_tuple = tuple(steps)
+    return list(chain.from_iterable(
+        (f'// {case["type"].upper()} CASE: {case["description"]}',) + steps_tuple
+        for case in cases.get("scenarios", [])
+    ))
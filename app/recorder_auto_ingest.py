@@ -1,9 +1,21 @@
 from __future__ import annotations
 
+import functools
 import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+from urllib.parse import urlparse
+
+try:  # pragma: no cover - optional fast JSON
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
 
 try:
     from .recorder_enricher import GENERATED_DIR, slugify, _describe_step  # type: ignore
@@ -26,6 +38,37 @@ def _first_non_empty(*values: Optional[Any]) -> str:
     return ""
 
 
+def _first_nonempty_str(
+    a: Optional[str], b: Optional[str] = None, c: Optional[str] = None, d: Optional[str] = None
+) -> str:
+    """Fast path of _first_non_empty for up to four str/None values (no varargs tuple)."""
+    try:
+        if a is not None:
+            s = a.strip()
+            if s:
+                return s
+        if b is not None:
+            s = b.strip()
+            if s:
+                return s
+        if c is not None:
+            s = c.strip()
+            if s:
+                return s
+        if d is not None:
+            s = d.strip()
+            if s:
+                return s
+    except AttributeError:
+        # Non-string value (number, list of labels, ...): use the general version.
+        return _first_non_empty(a, b, c, d)
+    return ""
+
+
+# Playwright selector kinds in order of preference.
+_PW_SELECTOR_KEYS = ("byRole", "byLabel", "byText", "byPlaceholder")
+
+
 def _normalise_playwright_selector(selector: Any, element: Dict[str, Any]) -> str:
     if isinstance(selector, str) and selector.strip():
         return selector.strip()
@@ -36,17 +79,12 @@ def _normalise_playwright_selector(selector: Any, element: Dict[str, Any]) -> st
             name = by_role.get("name")
             if role and name:
                 return f'getByRole("{role}", name="{name}")'
-        elif isinstance(by_role, str) and by_role.strip():
-            return by_role.strip()
-        by_label = selector.get("byLabel")
-        if isinstance(by_label, str) and by_label.strip():
-            return by_label.strip()
-        by_text = selector.get("byText")
-        if isinstance(by_text, str) and by_text.strip():
-            return by_text.strip()
-        by_placeholder = selector.get("byPlaceholder")
-        if isinstance(by_placeholder, str) and by_placeholder.strip():
-            return by_placeholder.strip()
+        for key in _PW_SELECTOR_KEYS:
+            value = selector.get(key)
+            if isinstance(value, str):
+                value = value.strip()
+                if value:
+                    return value
     stable = element.get("stableSelector")
     if stable:
         return str(stable)
@@ -59,66 +97,6 @@ def _normalise_playwright_selector(selector: Any, element: Dict[str, Any]) -> st
     return ""
 
 
-def _collect_xpath_candidates(*values: Optional[str]) -> List[str]:
-    seen: List[str] = []
-    for raw in values:
-        if not raw:
-            continue
-        candidate = str(raw)
-        if candidate and candidate not in seen:
-            seen.append(candidate)
-    return seen
-
-
-def _compose_locators(action: Dict[str, Any]) -> Tuple[Dict[str, Any], str]:
-    selectors = action.get("selectorStrategies") or {}
-    element = action.get("element") or {}
-
-    # New format: element.selector contains css/xpath/playwright
-    selector_obj = element.get("selector") or {}
-    
-    playwright_selector = (
-        selectors.get("aria") 
-        or selectors.get("playwright") 
-        or selector_obj.get("playwright")  # New format
-        or element.get("playwright")  # Old format
-    )
-    playwright_str = _normalise_playwright_selector(playwright_selector, element)
-    
-    # CSS: try selectorStrategies first, then element.selector, then element.cssPath
-    css = selectors.get("css") or selector_obj.get("css") or element.get("cssPath") or ""
-    
-    # XPath: try selectorStrategies first, then element.selector, then element.xpath
-    xpath = selectors.get("xpath") or selector_obj.get("xpath") or ""
-    element_xpath = element.get("xpath") or ""
-    labels_raw = element.get("labels")
-    if isinstance(labels_raw, (list, tuple, set)):
-        labels = ", ".join(str(label) for label in labels_raw if label)
-    else:
-        labels = str(labels_raw or "")
-    heading = _first_non_empty(element.get("nearestHeading"), element.get("heading"))
-    page_heading = _first_non_empty(element.get("pageHeading"), element.get("page_heading"))
-
-    locators: Dict[str, Any] = {
-        "playwright": playwright_str,
-        "stable": element.get("stableSelector") or css or element_xpath or xpath or "",
-        "xpath": xpath,
-        "xpath_candidates": _collect_xpath_candidates(xpath, element_xpath),
-        "raw_xpath": element_xpath or xpath,
-        "css": css,
-        "title": element.get("title") or "",
-        "labels": labels,
-        "role": element.get("role") or "",
-        "name": _first_non_empty(element.get("name"), element.get("ariaLabel")),
-        "tag": element.get("tag") or "",
-        "heading": heading,
-        "page_heading": page_heading,
-    }
-
-    element_label = _first_non_empty(labels, locators["name"], locators["title"], locators["tag"])
-    return locators, element_label
-
-
 def _is_valid_selector(selector: str, css: str = "", xpath: str = "") -> bool:
     """Check if a selector is valid and not too generic to be useful."""
     if not selector:
@@ -157,11 +135,31 @@ def _is_valid_selector(selector: str, css: str = "", xpath: str = "") -> bool:
     return True
 
 
-def _convert_action(action: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+# Shared read-only stand-in for missing nested sections, so the per-action
+# lookups below don't allocate a fresh empty dict each time.
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+
+@dataclass(slots=True)
+class _ConvertedAction:
+    """One recorder action after conversion; slotted to keep per-action overhead low."""
+
+    raw: Dict[str, Any]
+    locators: Dict[str, Any]
+    element: Dict[str, Any]
+    data_label: str
+    value: str
+    metadata: Dict[str, Any]
+
+
+def _convert_action(action: Dict[str, Any]) -> Optional[_ConvertedAction]:
     action_type = (action.get("type") or action.get("action") or "").lower()
-    extra = action.get("extra") or {}
-    selectors = action.get("selectorStrategies") or {}
-    element = action.get("element") or {}
+    extra = action.get("extra") or _EMPTY
+    selectors = action.get("selectorStrategies") or _EMPTY
+    element = action.get("element") or _EMPTY
+    # Bound lookups: this function runs once per recorded action.
+    el_get = element.get
+    sel_get = selectors.get
 
     mapped_action = None
     value = None
@@ -170,12 +168,12 @@ def _convert_action(action: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     if action_type in ("change", "input"):
         mapped_action = "fill"
         # Try extra.value first (old format), then element.value (new format)
-        value = extra.get("valueMasked") or extra.get("value") or element.get("value") or ""
+        value = extra.get("valueMasked") or extra.get("value") or el_get("value") or ""
     elif action_type == "click":
         mapped_action = "click"
         value = ""
     elif action_type == "press":
-        key = extra.get("key") or extra.get("code") or element.get("key")
+        key = extra.get("key") or extra.get("code") or el_get("key")
         if not key:
             return None
         mapped_action = "press"
@@ -183,38 +181,43 @@ def _convert_action(action: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     else:
         return None
 
-    locators, element_label = _compose_locators(action)
-    
+    # New format: element.selector contains css/xpath/playwright
+    selector_obj = el_get("selector") or _EMPTY
+    selector_css = selector_obj.get("css")
+    selector_xpath = selector_obj.get("xpath")
+    selector_playwright = selector_obj.get("playwright")
+    strategy_aria = sel_get("aria")
+    strategy_playwright = sel_get("playwright")
+
+    # CSS: try selectorStrategies first, then element.selector, then element.cssPath
+    css = sel_get("css") or selector_css or el_get("cssPath") or ""
+    # XPath: try selectorStrategies first, then element.selector, then element.xpath
+    xpath = sel_get("xpath") or selector_xpath or ""
+    element_xpath = el_get("xpath") or ""
+    raw_xpath = element_xpath or xpath
+    stable = el_get("stableSelector") or css or element_xpath or xpath or ""
+
     # Handle minimal recorder selector format
-    selector_obj = element.get("selector") or {}
-    playwright_selectors = selector_obj.get("playwright") or {}
-    
+    playwright_selectors = selector_playwright or _EMPTY
+
     # Only try to extract from playwright_selectors if it's a dict
     selector = None
     if isinstance(playwright_selectors, dict):
-        selector = (
-            playwright_selectors.get("byRole")
-            or playwright_selectors.get("byLabel")
-            or playwright_selectors.get("byText")
-            or playwright_selectors.get("byPlaceholder")
-        )
-    
+        for key in _PW_SELECTOR_KEYS:
+            selector = playwright_selectors.get(key)
+            if selector:
+                break
+
     # Fallback to other selector sources
     if not selector:
-        selector = (
-            selector_obj.get("css")
-            or selector_obj.get("xpath")
-            or selectors.get("aria")
-            or selectors.get("playwright")
-            or locators.get("stable")
-        )
+        selector = selector_css or selector_xpath or strategy_aria or strategy_playwright or stable
     if not selector:
-        selector = locators.get("css") or locators.get("raw_xpath") or ""
+        selector = css or raw_xpath or ""
 
     # Get CSS and XPath for validation
-    css_selector = selector_obj.get("css") or locators.get("css", "")
-    xpath_selector = selector_obj.get("xpath") or locators.get("raw_xpath", "") or locators.get("xpath", "")
-    
+    css_selector = selector_css or css
+    xpath_selector = selector_xpath or raw_xpath or xpath
+
     # Validate selector - reject generic body/html selectors
     if not _is_valid_selector(selector, css_selector, xpath_selector):
         return None
@@ -222,42 +225,108 @@ def _convert_action(action: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     if not selector:
         return None
 
+    labels_raw = el_get("labels")
+    if isinstance(labels_raw, (list, tuple, set)):
+        labels = ", ".join(str(label) for label in labels_raw if label)
+    else:
+        labels = str(labels_raw or "")
+    title = el_get("title") or ""
+    role = el_get("role") or ""
+    tag = el_get("tag") or ""
+    name = _first_nonempty_str(el_get("name"), el_get("ariaLabel"))
+    heading = _first_nonempty_str(el_get("nearestHeading"), el_get("heading"))
+    page_heading = _first_nonempty_str(el_get("pageHeading"), el_get("page_heading"))
+    element_label = _first_nonempty_str(labels, name, title, tag)
+
     notes = action.get("notes") or []
     description = "; ".join(n for n in notes if n)
+    value = str(value or "")
+
+    return _ConvertedAction(
+        raw={
+            "action": mapped_action,
+            "selector": selector,
+            "value": value,
+            "url": action.get("pageUrl"),
+            "description": description,
+        },
+        locators={
+            "playwright": _normalise_playwright_selector(
+                strategy_aria or strategy_playwright or selector_playwright or el_get("playwright"),
+                element,
+            ),
+            "stable": stable,
+            "xpath": xpath,
+            "xpath_candidates": list(dict.fromkeys(str(x) for x in (xpath, element_xpath) if x)),
+            "raw_xpath": raw_xpath,
+            "css": css,
+            "title": title,
+            "labels": labels,
+            "role": role,
+            "name": name,
+            "tag": tag,
+            "heading": heading,
+            "page_heading": page_heading,
+        },
+        element={
+            "tag": tag,
+            "title": title,
+            "label": element_label,
+            "role": role,
+            "name": name or element_label,
+            "xpath": xpath_selector,
+            "css": css_selector,
+            "heading": heading,
+            "page_heading": page_heading,
+        },
+        data_label=element_label or tag or "Field",
+        value=value,
+        metadata={
+            "actionId": action.get("actionId"),
+            "type": action_type,
+        },
+    )
 
-    raw_step = {
-        "action": mapped_action,
-        "selector": selector,
-        "value": str(value or ""),
-        "url": action.get("pageUrl"),
-        "description": description,
-    }
 
-    element_entry = {
-        "tag": locators.get("tag", ""),
-        "title": locators.get("title", ""),
-        "label": element_label,
-        "role": locators.get("role", ""),
-        "name": locators.get("name", "") or element_label,
-        "xpath": selector_obj.get("xpath") or locators.get("raw_xpath", "") or locators.get("xpath", ""),
-        "css": selector_obj.get("css") or locators.get("css", ""),
-        "heading": locators.get("heading", ""),
-        "page_heading": locators.get("page_heading", ""),
-    }
+# Auth provider patterns
+_AUTH_PATTERNS = (
+    'login.microsoftonline',
+    'microsoftonline.com',
+    'login.microsoft',
+    'okta.com',
+    'auth0.com',
+    'oauth',
+    'sso.',
+    'saml',
+)
+_AUTH_DOMAIN_RE = re.compile("|".join(re.escape(pattern) for pattern in _AUTH_PATTERNS), re.IGNORECASE)
 
-    data_label = element_label or locators.get("tag", "") or "Field"
 
-    return {
-        "raw": raw_step,
-        "locators": locators,
-        "element": element_entry,
-        "data_label": data_label,
-        "value": str(value or ""),
-        "metadata": {
-            "actionId": action.get("actionId"),
-            "type": action_type,
-        },
-    }
+@functools.lru_cache(maxsize=256)
+def _netloc(url: str) -> str:
+    """Lower-cased host of `url`; recordings revisit a handful of URLs, so this is cached."""
+    return urlparse(url).netloc.lower()
+
+
+def _iter_target_domain_actions(actions: Iterable[Dict[str, Any]], target_domain: str) -> Iterator[Dict[str, Any]]:
+    """Lazily yield actions that are on the target domain and not on an auth provider."""
+    for action in actions:
+        page_url = action.get("pageUrl") or ""
+
+        try:
+            current_domain = _netloc(page_url)
+        except Exception:
+            # If URL parsing fails, keep the action
+            yield action
+            continue
+
+        # Skip if on auth domain
+        if _AUTH_DOMAIN_RE.search(current_domain):
+            continue
+
+        # Keep if on target domain or subdomain
+        if target_domain in current_domain or current_domain in target_domain:
+            yield action
 
 
 def _filter_auth_steps(actions: List[Dict[str, Any]], original_url: Optional[str]) -> List[Dict[str, Any]]:
@@ -271,45 +340,14 @@ def _filter_auth_steps(actions: List[Dict[str, Any]], original_url: Optional[str
     if not original_url:
         return actions
     
-    from urllib.parse import urlparse
     try:
-        target_parsed = urlparse(original_url)
-        target_domain = target_parsed.netloc.lower()
+        target_domain = _netloc(original_url)
         if not target_domain:
             return actions
     except Exception:
         return actions
-    
-    # Auth provider patterns
-    auth_patterns = [
-        'login.microsoftonline',
-        'microsoftonline.com',
-        'login.microsoft',
-        'okta.com',
-        'auth0.com',
-        'oauth',
-        'sso.',
-        'saml',
-    ]
-    
-    filtered = []
-    for action in actions:
-        page_url = action.get("pageUrl") or ""
-        
-        try:
-            current_domain = urlparse(page_url).netloc.lower()
-            
-            # Skip if on auth domain
-            if any(pattern in current_domain for pattern in auth_patterns):
-                continue
-            
-            # Keep if on target domain or subdomain
-            if target_domain in current_domain or current_domain in target_domain:
-                filtered.append(action)
-        except Exception:
-            # If URL parsing fails, keep the action
-            filtered.append(action)
-    
+
+    filtered = list(_iter_target_domain_actions(actions, target_domain))
     return filtered if filtered else actions
 
 
@@ -323,38 +361,92 @@ def _deduplicate_actions(actions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     
     def _get_selectors(act: Dict[str, Any]) -> Tuple[str, str]:
         """Extract CSS and XPath from action."""
-        elem = act.get("element") or {}
-        sel = elem.get("selector") or {}
+        elem = act.get("element") or _EMPTY
+        sel = elem.get("selector") or _EMPTY
         css = sel.get("css") or elem.get("cssPath") or ""
         xpath = sel.get("xpath") or elem.get("xpath") or ""
         return (str(css), str(xpath))
     
+    # Extract selectors once per action, then collapse each run in one pass. A run
+    # is anchored on its first action and ends at the first action that differs.
+    selectors = [_get_selectors(act) for act in actions]
     deduplicated = []
-    i = 0
-    
-    while i < len(actions):
-        current = actions[i]
-        current_css, current_xpath = _get_selectors(current)
-        
-        # Look ahead to find duplicates with same CSS or XPath
-        j = i + 1
-        while j < len(actions):
-            next_action = actions[j]
-            next_css, next_xpath = _get_selectors(next_action)
-            
-            # If CSS or XPath matches, it's the same element
-            if (current_css and current_css == next_css) or (current_xpath and current_xpath == next_xpath):
-                j += 1  # Skip to next
-            else:
-                break  # Different element, stop looking
-        
+    anchor_css, anchor_xpath = selectors[0]
+    for idx in range(1, len(actions)):
+        css, xpath = selectors[idx]
+        # If CSS or XPath matches, it's the same element
+        if (anchor_css and anchor_css == css) or (anchor_xpath and anchor_xpath == xpath):
+            continue
         # Add the last action in the duplicate group
-        deduplicated.append(actions[j - 1])
-        i = j
+        deduplicated.append(actions[idx - 1])
+        anchor_css, anchor_xpath = css, xpath
+    deduplicated.append(actions[-1])
     
     return deduplicated
 
 
+@functools.lru_cache(maxsize=1024)
+def _iso_to_epoch_ms(value: str) -> Optional[int]:
+    """Epoch milliseconds for an ISO-8601 string (cached: actions share frame timestamps)."""
+    if value.isdigit():
+        return int(value)
+    try:
+        return int(datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp() * 1000)
+    except ValueError:
+        return None
+
+
+def _timestamp_key(action: Dict[str, Any]) -> Tuple[int, int]:
+    """Numeric sort key: timestampEpochMs, else timestamp (epoch or ISO), else receivedAt.
+
+    Fields that are missing or unparseable are skipped; an action with no usable
+    timestamp sorts after all timestamped ones, keeping its relative order.
+    """
+    for field in ("timestampEpochMs", "timestamp", "receivedAt"):
+        ts = action.get(field)
+        if not ts:
+            continue
+        if isinstance(ts, (int, float)):
+            return (0, int(ts))
+        if isinstance(ts, str):
+            epoch_ms = _iso_to_epoch_ms(ts)
+            if epoch_ms is not None:
+                return (0, epoch_ms)
+    return (1, 0)
+
+
+def _extract_original_url(metadata: Dict[str, Any]) -> Optional[str]:
+    """Original recording URL. Priority: options.url > options.originalUrl > startUrl."""
+    options = metadata.get("options") or {}
+    return (
+        options.get("url")
+        or options.get("originalUrl")
+        or metadata.get("startUrl")
+        or metadata.get("start_url")
+    )
+
+
+@functools.lru_cache(maxsize=2048)
+def _describe_step_cached(
+    flow_name: str,
+    action: str,
+    selector: str,
+    value: str,
+    description: str,
+    url: Optional[str],
+    previous_url: Optional[str],
+    previous_section: str,
+) -> Tuple[str, str, str]:
+    """(section, navigation, expected) for a step; repeated clicks on one selector hit the cache."""
+    enriched = _describe_step(
+        flow_name,
+        {"action": action, "selector": selector, "value": value, "description": description, "url": url},
+        previous_url,
+        previous_section,
+    )
+    return enriched["section"], enriched["navigation"], enriched["expected"]
+
+
 def build_refined_flow_from_metadata(
     metadata: Dict[str, Any],
     flow_name: Optional[str] = None,
@@ -381,24 +473,17 @@ def build_refined_flow_from_metadata(
     resolved_flow_name = flow_name or flow_name_from_file or metadata.get("flowName") or metadata.get("flow_name") or metadata.get("flowId") or metadata.get("flow_id") or "Recorder Flow"
     
     # Sort actions by timestamp to ensure chronological order
-    def _get_timestamp(action: Dict[str, Any]) -> str:
-        ts = action.get("timestamp") or action.get("timestampEpochMs") or action.get("receivedAt") or ""
-        return str(ts)
-    
     try:
-        actions = sorted(actions, key=_get_timestamp)
+        # Recorder output is almost always chronological already: compute each key
+        # once and only sort when an out-of-order pair exists.
+        keys = [_timestamp_key(action) for action in actions]
+        if any(later < earlier for earlier, later in zip(keys, keys[1:])):
+            order = sorted(range(len(actions)), key=keys.__getitem__)
+            actions = [actions[i] for i in order]
     except Exception:
         pass
     
-    # Get original URL from metadata
-    # Priority: options.url > options.originalUrl > startUrl
-    options = metadata.get("options") or {}
-    original_url = (
-        options.get("url") 
-        or options.get("originalUrl") 
-        or metadata.get("startUrl")
-        or metadata.get("start_url")
-    )
+    original_url = _extract_original_url(metadata)
     
     # DISABLED: Authentication filtering - keep all actions including auth steps
     # Users can manually remove auth steps if needed
@@ -408,77 +493,69 @@ def build_refined_flow_from_metadata(
     # Remove consecutive duplicates while preserving sequence
     actions = _deduplicate_actions(actions)
 
-    converted: List[Dict[str, Any]] = []
-    for action in actions:
-        entry = _convert_action(action)
-        if entry:
-            converted.append(entry)
-
-    if not converted:
-        # Check if there were degraded actions that couldn't be converted
-        degraded_count = sum(1 for a in actions if a.get("degraded"))
-        if degraded_count > 0:
-            raise ValueError(
-                f"No valid recorder actions found. {degraded_count} action(s) were degraded with incomplete selectors. "
-                "Please perform meaningful interactions in the browser (fill forms, click buttons with proper selectors) and try again."
-            )
-        else:
-            raise ValueError(
-                "No recorder actions could be converted into refined steps. "
-                "Please perform some interactions in the browser before stopping the recording."
-            )
-
-    elements_map: Dict[Tuple[str, str, str, str, str], Dict[str, Any]] = {}
-    for entry in converted:
-        element = entry["element"]
-        key = (
-            element.get("xpath", "") or "",
-            element.get("css", "") or "",
-            element.get("label", "") or "",
-            element.get("name", "") or "",
-            element.get("tag", "") or "",
-        )
-        if key not in elements_map:
-            elements_map[key] = element
-
+    # One pass per action: convert, register its element, describe and emit the step.
+    # Single \x1f-joined string key: one hash per element instead of a 5-tuple of strings.
+    elements_map: Dict[str, Dict[str, Any]] = {}
     refined_steps: List[Dict[str, Any]] = []
     previous_section = ""
     last_url = None
-    for idx, entry in enumerate(converted, start=1):
-        raw_step = entry["raw"]
-        enriched = _describe_step(resolved_flow_name, raw_step, last_url, previous_section)
-        previous_section = enriched["section"]
+    for entry in map(_convert_action, actions):
+        if entry is None:
+            continue
+        element = entry.element
+        # _convert_action always sets these keys.
+        key = (
+            f"{element['xpath']}\x1f{element['css']}\x1f"
+            f"{element['label']}\x1f{element['name']}\x1f{element['tag']}"
+        )
+        elements_map.setdefault(key, element)
+
+        raw_step = entry.raw
+        previous_section, navigation, expected = _describe_step_cached(
+            resolved_flow_name,
+            raw_step["action"],
+            raw_step["selector"],
+            raw_step["value"],
+            raw_step["description"],
+            raw_step["url"],
+            last_url,
+            previous_section,
+        )
         if raw_step.get("action") == "goto" and raw_step.get("url"):
             last_url = raw_step.get("url")
 
         data_field = ""
         if raw_step.get("action") == "fill":
-            value = entry["value"]
+            value = entry.value
             if value:
-                label = entry["data_label"]
+                label = entry.data_label
                 data_field = f"{label}: {value}" if label else value
 
         refined_steps.append(
             {
-                "step": idx,
+                "step": len(refined_steps) + 1,
                 "action": raw_step["action"].capitalize(),
-                "navigation": enriched["navigation"],
+                "navigation": navigation,
                 "data": data_field,
-                "expected": enriched["expected"],
-                "locators": entry["locators"],
+                "expected": expected,
+                "locators": entry.locators,
             }
         )
 
-    # Get original URL from metadata
-    # Priority: options.url > options.originalUrl > startUrl
-    options = metadata.get("options") or {}
-    original_url = (
-        options.get("url") 
-        or options.get("originalUrl") 
-        or metadata.get("startUrl")
-        or metadata.get("start_url")
-    )
-    
+    if not refined_steps:
+        # Check if there were degraded actions that couldn't be converted
+        degraded_count = sum(1 for a in actions if a.get("degraded"))
+        if degraded_count > 0:
+            raise ValueError(
+                f"No valid recorder actions found. {degraded_count} action(s) were degraded with incomplete selectors. "
+                "Please perform meaningful interactions in the browser (fill forms, click buttons with proper selectors) and try again."
+            )
+        else:
+            raise ValueError(
+                "No recorder actions could be converted into refined steps. "
+                "Please perform some interactions in the browser before stopping the recording."
+            )
+
     # Handle pages field - can be dict or list
     pages_data = metadata.get("pages") or {}
     if isinstance(pages_data, dict):
@@ -517,17 +594,28 @@ def auto_refine_and_ingest(
     session_path = Path(session_dir)
     
     # Track original action count for filtering statistics
-    # Priority: options.url > options.originalUrl > startUrl
-    options = metadata.get("options") or {}
-    original_url = (
-        options.get("url") 
-        or options.get("originalUrl") 
-        or metadata.get("startUrl")
-        or metadata.get("start_url")
-    )
     total_actions = len(metadata.get("actions") or [])
     
     refined_flow = build_refined_flow_from_metadata(metadata, flow_name=flow_name, session_dir=session_path)
+    return _persist_refined_flow(
+        session_path,
+        refined_flow,
+        total_actions=total_actions,
+        flow_id=metadata.get("flowId"),
+        ingest=ingest,
+    )
+
+
+def _persist_refined_flow(
+    session_path: Path,
+    refined_flow: Dict[str, Any],
+    *,
+    total_actions: int,
+    flow_id: Optional[str],
+    ingest: bool,
+) -> Dict[str, Any]:
+    """Write the refined flow to GENERATED_DIR and optionally ingest it."""
+    original_url = refined_flow.get("original_url")
     
     # Log filtering and deduplication statistics
     refined_steps = len(refined_flow.get("steps") or [])
@@ -539,12 +627,15 @@ def auto_refine_and_ingest(
 
     resolved_flow_name = refined_flow["flow_name"]
     slug = slugify(resolved_flow_name)
-    session_suffix = session_path.name or metadata.get("flowId") or "session"
+    session_suffix = session_path.name or flow_id or "session"
     output_path = GENERATED_DIR / f"{slug}-{session_suffix}.refined.json"
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    with output_path.open("w", encoding="utf-8") as fh:
-        json.dump(refined_flow, fh, indent=2, ensure_ascii=False)
+    if orjson is not None:
+        output_path.write_bytes(orjson.dumps(refined_flow, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with output_path.open("w", encoding="utf-8") as fh:
+            json.dump(refined_flow, fh, indent=2, ensure_ascii=False)
 
     ingest_stats: Optional[Dict[str, Any]] = None
     ingest_error: Optional[str] = None
@@ -571,3 +662,52 @@ def auto_refine_and_ingest(
         "refined_steps": refined_steps,
         "filtered_count": total_actions - refined_steps,
     }
+
+
+def _refine_session_worker(session_path: Path) -> Tuple[int, Optional[str], Dict[str, Any]] | str:
+    """Process-pool worker: load metadata.json and build the refined flow (CPU-bound part)."""
+    try:
+        raw = (session_path / "metadata.json").read_bytes()
+        metadata = orjson.loads(raw) if orjson is not None else json.loads(raw)
+        refined_flow = build_refined_flow_from_metadata(metadata, session_dir=session_path)
+        return len(metadata.get("actions") or []), metadata.get("flowId"), refined_flow
+    except Exception as exc:
+        return f"{type(exc).__name__}: {exc}"
+
+
+def auto_refine_and_ingest_batch(
+    session_dirs: Iterable[str | Path],
+    *,
+    ingest: bool = True,
+    max_workers: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Refine many recorder sessions (e.g. a nightly re-ingest backfill).
+
+    Building refined flows is CPU-bound and independent per session, so it runs in a
+    process pool. Writing and vector ingestion stay sequential in this process because
+    the Chroma store is single-writer. Failed sessions are reported with an ``error``.
+    """
+    paths = [Path(p) for p in session_dirs]
+    if len(paths) <= 1:
+        built = [_refine_session_worker(p) for p in paths]
+    else:
+        workers = min(len(paths), max_workers or os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            built = list(pool.map(_refine_session_worker, paths))
+
+    results: List[Dict[str, Any]] = []
+    for path, outcome in zip(paths, built):
+        if isinstance(outcome, str):
+            results.append({"session_dir": str(path), "error": outcome})
+            continue
+        total_actions, flow_id, refined_flow = outcome
+        result = _persist_refined_flow(
+            path,
+            refined_flow,
+            total_actions=total_actions,
+            flow_id=flow_id,
+            ingest=ingest,
+        )
+        result["session_dir"] = str(path)
+        results.append(result)
+    return results
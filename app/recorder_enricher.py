@@ -7,6 +7,7 @@ target URL is reached.
 
 The refined flows in app/generated_flows start from the intended application URL.
 """
+import functools
 import json
 import math
 import re
@@ -28,6 +29,7 @@ TEXT_PATTERN = re.compile(r"getByText\(\s*['\"]([^'\"]+)['\"]")
 PLACEHOLDER_PATTERN = re.compile(r"getByPlaceholder\(\s*['\"]([^'\"]+)['\"]")
 LOCATOR_TEXT_PATTERN = re.compile(r"text=([^\"'\)]+)")
 DATA_TESTID_PATTERN = re.compile(r"data-testid['\"]?\s*[:=]\s*['\"]([^'\"]+)['\"]")
+SLUG_SEPARATOR_PATTERN = re.compile(r"[^a-z0-9]+")
 
 
 @dataclass
@@ -68,8 +70,9 @@ class EnrichedStep:
     timings: Dict[str, Optional[int]]
 
 
+@functools.lru_cache(maxsize=256)
 def slugify(name: str) -> str:
-    slug = re.sub(r"[^a-zA-Z0-9]+", "-", name.lower()).strip("-")
+    slug = SLUG_SEPARATOR_PATTERN.sub("-", name.lower()).strip("-")
     return slug or "scenario"
 
 
@@ -4,8 +4,11 @@ Parses codegen output to extract selectors + captures page context
 """
 
 import argparse
+import hashlib
 import json
+import os
 import subprocess
+import sys
 import threading
 import time
 import re
@@ -13,6 +16,62 @@ from datetime import datetime
 from pathlib import Path
 from playwright.sync_api import sync_playwright
 
+try:  # pragma: no cover - optional fast JSON
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+# Quoted string argument in codegen output, e.g. "Save" or 'Save'
+_STR = r"""["'][^"']*["']"""
+
+# page.goto, page.click, page.fill, etc. fused into one alternation; the group
+# name that matched is the action type.
+_CODEGEN_ACTION_RE = re.compile(
+    r"page\.(?:"
+    rf"(?P<navigate>goto\({_STR}\))"
+    rf"|(?P<click>click\({_STR}\))"
+    rf"|(?P<fill>fill\({_STR},\s*{_STR}\))"
+    rf"|(?P<byRole>get_by_role\({_STR}.*?name={_STR}\))"
+    rf"|(?P<byLabel>get_by_label\({_STR}\))"
+    rf"|(?P<byText>get_by_text\({_STR}\))"
+    rf"|(?P<byPlaceholder>get_by_placeholder\({_STR}\))"
+    r")"
+)
+
+
+class _ActionScanner:
+    """Extract codegen actions from stdout bytes as they stream in.
+
+    Complete lines are parsed on each feed() so the regex work overlaps the
+    recording; every codegen action sits on a single line, so a partial tail
+    waits for the next chunk (or finish()).
+    """
+
+    def __init__(self, actions):
+        self.actions = actions
+        self._pending = bytearray()
+
+    def feed(self, chunk):
+        self._pending.extend(chunk)
+        self._scan(final=False)
+
+    def finish(self):
+        self._scan(final=True)
+
+    def _scan(self, final):
+        pending = self._pending
+        end = len(pending) if final else pending.rfind(b"\n") + 1
+        if end <= 0:
+            return
+        text = pending[:end].decode('utf-8', errors='replace')
+        del pending[:end]
+        for match in _CODEGEN_ACTION_RE.finditer(text):
+            self.actions.append({
+                'action': match.lastgroup,
+                'selector': match.group(0),
+                'timestamp': datetime.now().isoformat()
+            })
+
 
 def main():
     parser = argparse.ArgumentParser(description='Codegen-based Recorder')
@@ -32,7 +91,7 @@ def main():
     session_dir = output_root / session_name
     session_dir.mkdir(parents=True, exist_ok=True)
     
-    # Temp file for codegen output
+    # Raw codegen output, streamed to disk as it arrives
     codegen_output = session_dir / 'codegen_raw.txt'
     metadata_output = session_dir / 'metadata.json'
     
@@ -43,7 +102,8 @@ def main():
         'startUrl': args.url,
         'browser': args.browser,
         'actions': [],
-        'codegenRaw': ''
+        'codegenRawPath': codegen_output.name,
+        'codegenRawSha256': ''
     }
     
     print(f"[Codegen Recorder] Session: {session_name}")
@@ -61,22 +121,55 @@ def main():
     if args.headless:
         print("[Warning] Codegen doesn't support headless, running headed")
     
+    raw_file = codegen_output.open('wb')
+    raw_hash = hashlib.sha256()
+    output_lock = threading.Lock()
+    # Set once the transcript is final; a reader still blocked on the pipe
+    # drops anything it reads afterwards
+    output_done = threading.Event()
+    thread = None
+    
+    # Used under output_lock; holds stdout bytes not yet parsed
+    scanner = _ActionScanner(recording['actions'])
+    
     try:
         # Start codegen process
         process = subprocess.Popen(
             cmd,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
-            text=True,
-            bufsize=1
+            bufsize=0
         )
         
-        output_lines = []
-        
         def read_output():
-            for line in process.stdout:
-                output_lines.append(line)
-                print(f"[CODEGEN] {line.rstrip()}")
+            # The reader owns raw_file and closes it when it stops
+            fd = process.stdout.fileno()
+            echo = sys.stdout.buffer
+            prefix = b"[CODEGEN] "
+            at_line_start = True
+            try:
+                while True:
+                    chunk = os.read(fd, 65536)
+                    if not chunk:
+                        break
+                    with output_lock:
+                        if output_done.is_set():
+                            break
+                        raw_file.write(chunk)
+                        raw_hash.update(chunk)
+                        scanner.feed(chunk)
+                    # Echo line-prefixed output without decoding each line
+                    echoed = chunk.replace(b"\n", b"\n" + prefix)
+                    if at_line_start:
+                        echoed = prefix + echoed
+                    at_line_start = chunk.endswith(b"\n")
+                    if at_line_start:
+                        echoed = echoed[:-len(prefix)]
+                    echo.write(echoed)
+                    echo.flush()
+            finally:
+                with output_lock:
+                    raw_file.close()
         
         thread = threading.Thread(target=read_output, daemon=True)
         thread.start()
@@ -90,32 +183,6 @@ def main():
                 process.terminate()
                 break
         
-        thread.join(timeout=1)
-        
-        # Parse codegen output
-        codegen_text = ''.join(output_lines)
-        recording['codegenRaw'] = codegen_text
-        
-        # Extract actions from codegen output
-        # Look for page.goto, page.click, page.fill, etc.
-        action_patterns = [
-            (r'page\.goto\(["\']([^"\']*)["\'']\)', 'navigate'),
-            (r'page\.click\(["\']([^"\']*)["\'']\)', 'click'),
-            (r'page\.fill\(["\']([^"\']*)["\''],\s*["\']([^"\']*)["\'']\)', 'fill'),
-            (r'page\.get_by_role\(["\']([^"\']*)["\''].*?name=["\']([^"\']*)["\'']\)', 'byRole'),
-            (r'page\.get_by_label\(["\']([^"\']*)["\'']\)', 'byLabel'),
-            (r'page\.get_by_text\(["\']([^"\']*)["\'']\)', 'byText'),
-            (r'page\.get_by_placeholder\(["\']([^"\']*)["\'']\)', 'byPlaceholder'),
-        ]
-        
-        for pattern, action_type in action_patterns:
-            for match in re.finditer(pattern, codegen_text):
-                recording['actions'].append({
-                    'action': action_type,
-                    'selector': match.group(0),
-                    'timestamp': datetime.now().isoformat()
-                })
-        
     except KeyboardInterrupt:
         print("\n[Codegen Recorder] Stopping...")
         if process.poll() is None:
@@ -123,12 +190,29 @@ def main():
     except Exception as e:
         print(f"[Error] {e}")
     
+    # Let the reader drain the pipe after terminate()
+    if thread is not None:
+        thread.join(timeout=5)
+    
     # Save
+    with output_lock:
+        output_done.set()
+        # Parse whatever trails the last newline
+        scanner.finish()
+        if thread is None:
+            raw_file.close()
+        elif not raw_file.closed:
+            # Reader is still blocked on the pipe and closes the file when it
+            # wakes; flush now so the file on disk matches the digest
+            raw_file.flush()
+        recording['codegenRawSha256'] = raw_hash.hexdigest()
     recording['endTime'] = datetime.now().isoformat()
     recording['totalActions'] = len(recording['actions'])
     
-    metadata_output.write_text(json.dumps(recording, indent=2), encoding='utf-8')
-    codegen_output.write_text(recording['codegenRaw'], encoding='utf-8')
+    if orjson is not None:
+        metadata_output.write_bytes(orjson.dumps(recording, option=orjson.OPT_INDENT_2))
+    else:
+        metadata_output.write_text(json.dumps(recording, indent=2), encoding='utf-8')
     
     print(f"\n[Codegen Recorder] Captured {len(recording['actions'])} actions")
     print(f"[Codegen Recorder] Saved: {metadata_output}")
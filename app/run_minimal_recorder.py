@@ -6,6 +6,7 @@ No JavaScript injection - uses native browser events
 
 import argparse
 import json
+import os
 import signal
 import sys
 import time
@@ -13,9 +14,35 @@ import threading
 from datetime import datetime
 from pathlib import Path
 from collections import deque
-from playwright.sync_api import sync_playwright, Page
+from playwright.sync_api import sync_playwright, Page, Error as PlaywrightError
 
-# Simplified injection - no binding, uses localStorage for communication
+try:  # pragma: no cover - optional fast JSON
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+# Main loop tick; Playwright callbacks (exposed bindings) are dispatched while it waits.
+# The tick adapts: it halves while actions keep arriving and grows 1.5x when idle.
+POLL_INTERVAL = 0.2
+MIN_POLL_INTERVAL = 0.02
+MAX_POLL_INTERVAL = 1.0
+# With the binding in place, the pull-based poll only runs this often (seconds) as a fallback
+FALLBACK_POLL_INTERVAL = 2.0
+# metadata.json is rewritten at most this often (seconds) while actions arrive, so a
+# hard-killed recorder (process.terminate() on Windows skips signal handlers) still
+# leaves a readable session behind
+CHECKPOINT_INTERVAL = 1.0
+# Evaluate failures that just mean the page is navigating or closing
+TRANSIENT_EVAL_ERRORS = (
+    'Execution context was destroyed',
+    'Target closed',
+    'Target page, context or browser has been closed',
+    'Cannot find context with specified id',
+)
+
+# Actions are pushed through the __minRecEmit binding when available and
+# buffered for window.__getRecordedActions polling otherwise. Either way each
+# action leaves the page as one JSON string (a ready-made JSONL line).
 MINIMAL_INJECT = """
 (() => {
     if (window.__minRecInstalled) return;
@@ -23,7 +50,24 @@ MINIMAL_INJECT = """
     
     const actions = [];
     
-    const getSelector = (el) => {
+    // className -> '.a.b' suffix; many elements share the same class list
+    const WS_RE = /\\s+/;
+    const classCache = new Map();
+    
+    // Per-element memo: mousedown+click and repeated clicks hit the same node
+    const memo = (compute) => {
+        const cache = new WeakMap();
+        return (el) => {
+            let value = cache.get(el);
+            if (value === undefined) {
+                value = compute(el);
+                cache.set(el, value);
+            }
+            return value;
+        };
+    };
+    
+    const getSelector = memo((el) => {
         if (el.id) return `#${el.id}`;
         if (el.name) return `[name="${el.name}"]`;
         let path = [];
@@ -35,15 +79,20 @@ MINIMAL_INJECT = """
                 break;
             }
             if (el.className) {
-                selector += '.' + el.className.trim().split(/\\s+/).join('.');
+                let cls = classCache.get(el.className);
+                if (cls === undefined) {
+                    cls = '.' + el.className.trim().split(WS_RE).join('.');
+                    classCache.set(el.className, cls);
+                }
+                selector += cls;
             }
             path.unshift(selector);
             el = el.parentElement;
         }
         return path.join(' > ');
-    };
+    });
     
-    const getXPath = (el) => {
+    const getXPath = memo((el) => {
         if (el.id) return `//*[@id="${el.id}"]`;
         const parts = [];
         while (el && el.nodeType === 1) {
@@ -57,9 +106,9 @@ MINIMAL_INJECT = """
             el = el.parentElement;
         }
         return '/' + parts.join('/');
-    };
+    });
     
-    const getRole = (el) => {
+    const getRole = memo((el) => {
         const role = el.getAttribute('role');
         if (role) return role;
         const tag = el.tagName.toLowerCase();
@@ -71,7 +120,7 @@ MINIMAL_INJECT = """
         if (tag === 'textarea') return 'textbox';
         if (tag === 'select') return 'combobox';
         return '';
-    };
+    });
     
     const getAccessibleName = (el) => {
         const ariaLabel = el.getAttribute('aria-label');
@@ -85,8 +134,48 @@ MINIMAL_INJECT = """
         return '';
     };
     
+    // outerHTML travels once per distinct markup; actions carry only its hash
+    const htmlSent = new Set();
+    const fnv1a = (str) => {
+        let h = 0x811c9dc5;
+        for (let i = 0; i < str.length; i++) {
+            h ^= str.charCodeAt(i);
+            h = Math.imul(h, 0x01000193);
+        }
+        return (h >>> 0).toString(16).padStart(8, '0');
+    };
+    
+    // Last click time per element: mousedown and click both report one press
+    const lastClick = new WeakMap();
+    const CLICK_DEDUPE_MS = 250;
+    
+    // Typing fires one input event per keystroke; record the settled value once
+    const INPUT_SETTLE_MS = 300;
+    let pendingInput = null;
+    let pendingTimer = null;
+    
+    const flushInput = () => {
+        if (pendingTimer !== null) {
+            clearTimeout(pendingTimer);
+            pendingTimer = null;
+        }
+        if (pendingInput) {
+            const target = pendingInput;
+            pendingInput = null;
+            capture('input', target);
+        }
+    };
+    
     const capture = (action, target) => {
         if (!target || target.nodeType !== 1) return;
+        // Keep order: pending typing lands before the click/change that follows it
+        if (action !== 'input') flushInput();
+        if (action === 'click') {
+            const now = Date.now();
+            const last = lastClick.get(target);
+            lastClick.set(target, now);
+            if (last !== undefined && now - last < CLICK_DEDUPE_MS) return;
+        }
         
         const role = getRole(target);
         const name = getAccessibleName(target);
@@ -116,31 +205,53 @@ MINIMAL_INJECT = """
             selectors.byTestId = `getByTestId('${testId}')`;
         }
         
-        actions.push({
+        const html = target.outerHTML;
+        const htmlHash = `${fnv1a(html)}-${html.length.toString(16)}`;
+        const record = {
             action: action,
             timestamp: Date.now(),
             pageUrl: window.location.href,
             pageTitle: document.title,
             element: {
-                html: target.outerHTML,
+                htmlHash: htmlHash,
                 selector: {
                     css: getSelector(target),
                     xpath: getXPath(target),
                     playwright: selectors
                 }
             }
-        });
+        };
+        if (!htmlSent.has(htmlHash)) {
+            htmlSent.add(htmlHash);
+            record.elementHtml = html;
+        }
+        const line = JSON.stringify(record);
+        if (typeof window.__minRecEmit === 'function') {
+            // Playwright bindings return a promise; raw CDP bindings return nothing
+            const sent = window.__minRecEmit(line);
+            if (sent && typeof sent.catch === 'function') sent.catch(() => actions.push(line));
+        } else {
+            actions.push(line);
+        }
     };
     
-    // Store actions in window for polling
+    // Store actions in window for polling: newline-separated JSON lines
+    // (JSON.stringify never emits a raw newline)
     window.__getRecordedActions = () => {
-        const result = actions.slice();
+        const result = actions.join('\\n');
         actions.length = 0;
         return result;
     };
     
     document.addEventListener('click', (e) => capture('click', e.target), { capture: true, passive: true });
-    document.addEventListener('input', (e) => capture('input', e.target), { capture: true, passive: true });
+    document.addEventListener('input', (e) => {
+        if (pendingInput && pendingInput !== e.target) flushInput();
+        pendingInput = e.target;
+        if (pendingTimer !== null) clearTimeout(pendingTimer);
+        pendingTimer = setTimeout(flushInput, INPUT_SETTLE_MS);
+    }, { capture: true, passive: true });
+    document.addEventListener('blur', flushInput, { capture: true, passive: true });
+    window.addEventListener('pagehide', flushInput);
     document.addEventListener('change', (e) => capture('change', e.target), { capture: true, passive: true });
     
     // Capture submit events (for forms)
@@ -160,6 +271,38 @@ MINIMAL_INJECT = """
 """
 
 
+_loads = orjson.loads if orjson is not None else json.loads
+_json_decoder = json.JSONDecoder()
+
+
+def _tag_page(raw: str, page_id: str) -> str:
+    """Splice pageId into a serialized action without re-encoding it"""
+    return '{"pageId":' + json.dumps(page_id) + ',' + raw[1:]
+
+
+def _peek(raw: str, key: str) -> str:
+    """Read one top-level string field from a serialized action.
+
+    Only used for console output on fields the recorder script writes ahead
+    of any free text (action, pageUrl), so the first match is the real key.
+    """
+    marker = f'"{key}":'
+    idx = raw.find(marker)
+    if idx < 0:
+        return ''
+    try:
+        value, _ = _json_decoder.raw_decode(raw, idx + len(marker))
+    except ValueError:
+        return ''
+    return value if isinstance(value, str) else ''
+
+
+def _dump_metadata(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode('utf-8')
+
+
 def main():
     parser = argparse.ArgumentParser(description='Minimal Recorder: page URL + element HTML + Playwright selectors')
     parser.add_argument('--url', required=True, help='Starting URL')
@@ -180,6 +323,9 @@ def main():
     session_dir.mkdir(parents=True, exist_ok=True)
     
     output_path = session_dir / 'metadata.json'
+    # Append-only action log while recording; metadata.json is checkpointed from it
+    # and rewritten in full at shutdown
+    actions_path = session_dir / 'actions.jsonl'
     
     recording = {
         'metadataVersion': '2025.minimal',
@@ -187,8 +333,12 @@ def main():
         'startTime': datetime.now().isoformat(),
         'startUrl': args.url,
         'browser': args.browser,
+        # Serialized action lines while recording; parsed once at shutdown
         'actions': [],
-        'pages': {}
+        'actionsLog': actions_path.name,
+        'pages': {},
+        # htmlHash -> outerHTML, shared by every action on that markup
+        'elements': {}
     }
     
     print(f"[Minimal Recorder] Session: {session_name}")
@@ -200,87 +350,243 @@ def main():
     browser = getattr(pw, args.browser).launch(headless=args.headless)
     context = browser.new_context()
     
-    # Queue for thread-safe action capture
+    # Queue for thread-safe action capture (deque append/popleft are atomic)
     action_queue = deque()
-    queue_lock = threading.Lock()
     stop_event = threading.Event()
+    # Guards fsync against the final close; appends themselves need no lock
     write_lock = threading.Lock()
+    # Set when actions.jsonl has appends that have not been fsynced
+    dirty = threading.Event()
+    
+    # O_APPEND: every os.write lands at the end of the file in one step
+    actions_fd = os.open(actions_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    
+    def record_actions(lines):
+        """Keep serialized actions in memory and append them to actions.jsonl"""
+        if not lines:
+            return
+        # The log lines keep elementHtml on first sight so the JSONL is
+        # self-contained; it moves to recording['elements'] at shutdown
+        recording['actions'].extend(lines)
+        buf = memoryview(('\n'.join(lines) + '\n').encode('utf-8'))
+        # One syscall per drain; loop only for the rare short write
+        while buf:
+            buf = buf[os.write(actions_fd, buf):]
+        dirty.set()
+    
+    checkpointed = [0, 0.0]  # action count and monotonic time of the last checkpoint
+    
+    def write_checkpoint():
+        """Rewrite metadata.json from the already-serialized action lines.
+        
+        Runs on the main thread (recording['pages'] is mutated there). The action
+        lines are spliced in as-is, so a checkpoint costs a join, not a re-encode;
+        elementHtml stays inline until the final write.
+        """
+        count = len(recording['actions'])
+        now = time.monotonic()
+        if count == checkpointed[0] or now - checkpointed[1] < CHECKPOINT_INTERVAL:
+            return
+        header = {k: v for k, v in recording.items() if k not in ('actions', 'elements')}
+        header['status'] = 'recording'
+        head = orjson.dumps(header) if orjson is not None else json.dumps(header, separators=(',', ':')).encode('utf-8')
+        body = ','.join(recording['actions'][:count]).encode('utf-8')
+        tmp_path = output_path.with_name(output_path.name + '.tmp')
+        try:
+            tmp_path.write_bytes(head[:-1] + b',"actions":[' + body + b']}')
+            os.replace(tmp_path, output_path)
+        except OSError as e:
+            print(f"[Error] Metadata checkpoint failed: {e}")
+            return
+        checkpointed[0] = count
+        checkpointed[1] = now
     
     # Background writer thread
     def background_writer():
-        """Continuously write actions to metadata.json in background"""
-        last_write = 0
+        """Flush appended actions to disk in background"""
         while not stop_event.is_set():
-            time.sleep(1)  # Write every 1 second
-            
-            # Check if there are new actions
+            # Idle wakeups only re-check stop_event; no lock until something is appended
+            if not dirty.wait(timeout=1.0):
+                continue
+            time.sleep(1)  # Coalesce a burst of actions into one flush
+            dirty.clear()
             with write_lock:
-                if len(recording['actions']) > last_write:
-                    try:
-                        output_path.write_text(json.dumps(recording, indent=2), encoding='utf-8')
-                        last_write = len(recording['actions'])
-                    except Exception as e:
-                        print(f"[Error] Background write failed: {e}")
+                if stop_event.is_set():
+                    return
+                try:
+                    os.fsync(actions_fd)
+                except Exception as e:
+                    print(f"[Error] Background write failed: {e}")
     
     writer_thread = threading.Thread(target=background_writer, daemon=True)
     writer_thread.start()
     
     # Track all pages
+    # Keyed by the Page objects themselves (held strongly), never by id(): a
+    # recycled id() could alias a new tab onto a closed one
     active_pages = {}
     page_counter = [0]
+    # Page -> JSHandle to window.__getRecordedActions in the current document
+    recorder_handles = {}
+    # Open tabs (insertion-ordered), maintained by setup_page and close events
+    open_pages = {}
     
     def get_page_id(page):
         """Get or create page ID"""
-        page_key = id(page)
-        if page_key not in active_pages:
+        info = active_pages.get(page)
+        if info is None:
             page_counter[0] += 1
             page_id = f"page-{page_counter[0]}"
-            active_pages[page_key] = {
+            info = active_pages[page] = {
                 'pageId': page_id,
                 'url': page.url,
                 'title': '',
-                'openedAt': datetime.now().isoformat()
+                # Raw clock while recording; formatted once in the final write
+                'openedAtNs': time.time_ns()
             }
-            recording['pages'][page_id] = active_pages[page_key]
+            recording['pages'][page_id] = info
             print(f"[NEW TAB] {page_id}: {page.url}")
-        return active_pages[page_key]['pageId']
+        return info['pageId']
+    
+    # Pages whose documents get MINIMAL_INJECT from a per-page init script
+    init_scripted = set()
+    
+    def bind_recorder(page: Page, inject: bool = False):
+        """Keep a handle to the recorder's drain function, injecting it if needed"""
+        if inject or page not in init_scripted:
+            page.evaluate(MINIMAL_INJECT)
+        handle = page.evaluate_handle('() => window.__getRecordedActions')
+        stale = recorder_handles.pop(page, None)
+        recorder_handles[page] = handle
+        if stale is not None:
+            try:
+                stale.dispose()
+            except Exception:
+                pass
+    
+    def forget_page(page: Page):
+        open_pages.pop(page, None)
+        init_scripted.discard(page)
+        recorder_handles.pop(page, None)
+        cdp_sessions.pop(page, None)
+    
+    poll_errors_seen = set()
     
     def poll_page_actions(page: Page):
         """Poll actions from a page"""
+        # Skip pages that cannot answer instead of raising and catching every tick
+        if page.is_closed() or page.main_frame.url == 'about:blank':
+            return
+        try:
+            handle = recorder_handles.get(page)
+            lines = None
+            if handle is not None:
+                try:
+                    # Call the cached function object; no expression lookup per tick
+                    lines = handle.evaluate('f => f()')
+                except PlaywrightError:
+                    # Document navigated away; on_load rebinds the new one
+                    recorder_handles.pop(page, None)
+            if lines is None:
+                lines = page.evaluate('() => window.__getRecordedActions ? window.__getRecordedActions() : ""')
+        except PlaywrightError as e:
+            message = str(e)
+            if not any(marker in message for marker in TRANSIENT_EVAL_ERRORS) and message not in poll_errors_seen:
+                poll_errors_seen.add(message)
+                print(f"[Error] poll_page_actions: {message}")
+            return
+        if lines:
+            page_id = get_page_id(page)
+            for raw in lines.split('\n'):
+                action_queue.append(_tag_page(raw, page_id))
+    
+    def on_emit(source, raw):
+        """Binding callback: the page pushed one serialized action"""
+        if not isinstance(raw, str) or not raw.startswith('{'):
+            return
+        action_queue.append(_tag_page(raw, get_page_id(source['page'])))
+    
+    # Page -> CDPSession carrying the __minRecEmit binding (Chromium only)
+    cdp_sessions = {}
+    use_cdp = args.browser == 'chromium'
+    
+    def attach_cdp_binding(page: Page):
+        """Add __minRecEmit straight through CDP; events go to the queue as-is"""
+        def on_binding_called(event):
+            if event.get('name') != '__minRecEmit':
+                return
+            raw = event.get('payload')
+            if isinstance(raw, str) and raw.startswith('{'):
+                action_queue.append(_tag_page(raw, get_page_id(page)))
+        
         try:
-            actions = page.evaluate('() => window.__getRecordedActions ? window.__getRecordedActions() : []')
-            if actions:
-                page_id = get_page_id(page)
-                for action in actions:
-                    action['pageId'] = page_id
-                    with queue_lock:
-                        action_queue.append(action)
-        except Exception:
-            pass
+            cdp = context.new_cdp_session(page)
+            cdp.on('Runtime.bindingCalled', on_binding_called)
+            cdp.send('Runtime.enable')
+            # Applies to the current document and every later one in this tab
+            cdp.send('Runtime.addBinding', {'name': '__minRecEmit'})
+            cdp_sessions[page] = cdp
+        except Exception as e:
+            print(f"[Warning] CDP binding unavailable for {get_page_id(page)}, polling instead: {e}")
+    
+    if use_cdp:
+        # Bound per page in setup_page
+        binding_ready = True
+    else:
+        # Context-level binding covers the first page and every tab/popup opened later
+        try:
+            context.expose_binding('__minRecEmit', on_emit)
+            binding_ready = True
+        except Exception as e:
+            print(f"[Warning] Action binding unavailable, polling instead: {e}")
+            binding_ready = False
+    
+    def wait_tick(seconds: float):
+        """Sleep inside Playwright so binding callbacks can run on this thread"""
+        pump_page = next(iter(open_pages), None)
+        if binding_ready and pump_page is not None:
+            try:
+                pump_page.wait_for_timeout(seconds * 1000)
+                return
+            except Exception:
+                pass
+        # Returns as soon as Ctrl+C/SIGTERM sets stop_event
+        stop_event.wait(seconds)
     
     def setup_page(page: Page):
-        """Setup recorder on a page - inject AFTER load"""
+        """Setup recorder on a page once the tab exists"""
+        open_pages[page] = None
+        if use_cdp:
+            attach_cdp_binding(page)
         try:
-            # DO NOT use add_init_script - it blocks new tabs
-            # page.add_init_script(MINIMAL_INJECT)
+            # Per-page init script, registered after the tab exists (only the
+            # context-level one blocks new tabs): every later navigation gets
+            # the recorder without re-evaluating the source from Python
+            try:
+                page.add_init_script(MINIMAL_INJECT)
+                init_scripted.add(page)
+            except Exception as e:
+                print(f"[Warning] init script unavailable, injecting on load: {e}")
             
             def on_load():
                 try:
                     page_id = get_page_id(page)
-                    active_pages[id(page)]['url'] = page.url
-                    active_pages[id(page)]['title'] = page.title()
-                    recording['pages'][page_id] = active_pages[id(page)]
+                    info = active_pages[page]
+                    info['url'] = page.url
+                    info['title'] = page.title()
+                    recording['pages'][page_id] = info
                     print(f"[LOADED] {page_id}: {page.url}")
                     
-                    # Inject script after load
+                    # Refresh the drain handle for the new document
                     try:
-                        page.evaluate(MINIMAL_INJECT)
+                        bind_recorder(page)
                     except Exception:
                         pass
                 except Exception as e:
                     print(f"[Error] on_load: {e}")
             
             page.on('load', on_load)
+            page.on('close', forget_page)
             
         except Exception as e:
             print(f"[Error] setup_page: {e}")
@@ -300,8 +606,8 @@ def main():
                 # Wait for page to be ready
                 page.wait_for_load_state('domcontentloaded', timeout=30000)
                 print(f"[TAB LOADED] {page_id}: {page.url}")
-                # Inject script
-                page.evaluate(MINIMAL_INJECT)
+                # The tab's first document predates its init script
+                bind_recorder(page, inject=True)
                 print(f"[TAB READY] {page_id}")
             except Exception as e:
                 print(f"[TAB ERROR] {page_id}: {e}")
@@ -333,35 +639,39 @@ def main():
     
     # Main loop
     start = time.time()
+    last_poll = 0.0
+    sleep_time = POLL_INTERVAL
     try:
         while not stop_event.is_set():
-            # Poll all active pages for actions
-            for page_key in list(active_pages.keys()):
-                try:
-                    # Find the page object
-                    for p in context.pages:
-                        if id(p) == page_key:
-                            poll_page_actions(p)
-                            break
-                except Exception:
-                    pass
+            # Poll all open pages for actions. Pages that have the binding push
+            # their actions, so this is only a fallback.
+            now = time.monotonic()
+            if not binding_ready or now - last_poll >= FALLBACK_POLL_INTERVAL:
+                last_poll = now
+                for p in list(open_pages):
+                    poll_page_actions(p)
             
             # Drain action queue
+            batch = []
             while True:
-                with queue_lock:
-                    if not action_queue:
-                        break
-                    payload = action_queue.popleft()
+                try:
+                    line = action_queue.popleft()
+                except IndexError:
+                    break
                 
-                with write_lock:
-                    recording['actions'].append(payload)
+                batch.append(line)
                 
-                action = payload.get('action', '')
-                url = payload.get('pageUrl', '')
-                page_id = payload.get('pageId', '')
+                action = _peek(line, 'action')
+                url = _peek(line, 'pageUrl')
+                page_id = _peek(line, 'pageId')
                 print(f"[{action.upper()}] [{page_id}] {url}")
+            record_actions(batch)
+            write_checkpoint()
+            drained = len(batch)
             
-            time.sleep(0.2)
+            # Busy: come back sooner. Idle: back off toward MAX_POLL_INTERVAL.
+            sleep_time = min(MAX_POLL_INTERVAL, max(MIN_POLL_INTERVAL, sleep_time * (0.5 if drained else 1.5)))
+            wait_tick(sleep_time)
             
             if args.timeout and (time.time() - start) >= args.timeout:
                 print(f"\n[Minimal Recorder] Timeout reached ({args.timeout}s)")
@@ -373,23 +683,39 @@ def main():
         stop_event.set()
     
     # Final drain
-    time.sleep(0.3)
-    while action_queue:
-        with queue_lock:
-            if not action_queue:
-                break
-            payload = action_queue.popleft()
-        with write_lock:
-            recording['actions'].append(payload)
+    wait_tick(0.3)
+    for p in list(open_pages):
+        poll_page_actions(p)
+    batch = []
+    while True:
+        try:
+            batch.append(action_queue.popleft())
+        except IndexError:
+            break
+    record_actions(batch)
     
     # Finalize
+    actions = []
+    for line in recording['actions']:
+        payload = _loads(line)
+        html = payload.pop('elementHtml', None)
+        if html is not None:
+            recording['elements'][(payload.get('element') or {}).get('htmlHash')] = html
+        actions.append(payload)
+    recording['actions'] = actions
     recording['endTime'] = datetime.now().isoformat()
     recording['totalActions'] = len(recording['actions'])
     recording['totalPages'] = len(recording['pages'])
+    for page_info in recording['pages'].values():
+        opened_ns = page_info.pop('openedAtNs', None)
+        if opened_ns is not None:
+            page_info['openedAt'] = datetime.fromtimestamp(opened_ns / 1e9).isoformat()
     
     # Final write
     with write_lock:
-        output_path.write_text(json.dumps(recording, indent=2), encoding='utf-8')
+        os.fsync(actions_fd)
+        os.close(actions_fd)
+        output_path.write_bytes(_dump_metadata(recording))
     
     browser.close()
     pw.stop()
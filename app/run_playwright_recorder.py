@@ -2,9 +2,11 @@
 
 Artifacts per session:
   recordings/<session>/
-    - metadata.json
-    - dom/*.html              (with --capture-dom)
-    - screenshots/*.png       (with --capture-screenshots)
+    - metadata.json           (checkpointed every few seconds, complete at shutdown)
+    - actions.jsonl           (one line per action, appended as it happens)
+    - page_events.jsonl       (one line per page context event)
+    - dom/*.json.gz           (with --capture-dom; CDP DOMSnapshot, dom/*.html.gz off Chromium)
+    - screenshots/*.jpg|png   (with --capture-screenshots; JPEG element clips, PNG full page)
     - network.har             (unless --no-har)
     - trace.zip               (unless --no-trace)
 
@@ -15,7 +17,12 @@ Usage (PowerShell):
 from __future__ import annotations
 
 import argparse
+import base64
+import gzip
 import json
+import os
+import queue
+import re
 import signal
 import sys
 import threading
@@ -23,28 +30,37 @@ import time
 from datetime import datetime, timezone
 from pathlib import Path
 from types import FrameType
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from playwright.sync_api import (
   Browser,
   BrowserContext,
+  CDPSession,
   ConsoleMessage,
   Frame,
   Page,
   Playwright,
   Request,
   Response,
+  Route,
   sync_playwright,
 )
 
 from app.browser_utils import SUPPORTED_BROWSERS, normalize_browser_name
 
+try:  # pragma: no cover - optional fast JSON
+  import orjson  # type: ignore
+except ImportError:  # pragma: no cover
+  orjson = None  # type: ignore
+
 
 # ----------------------------- Defaults -----------------------------
 DEFAULT_USER_AGENT = (
   "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
   "(KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36"
 )
+# Resource types aborted with --block-media; they never reach the HAR
+BLOCKED_MEDIA_TYPES = frozenset({"image", "font", "media"})
 
 
 # ----------------------------- Helpers ------------------------------
@@ -52,14 +68,26 @@ def _iso_now() -> str:
   return datetime.now(timezone.utc).isoformat()
 
 
-def _mask(value: Optional[str]) -> Optional[str]:
+def _dump_json(obj: Any, pretty: bool = False) -> bytes:
+  if orjson is not None:
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+  if pretty:
+    return json.dumps(obj, indent=2).encode("utf-8")
+  return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+_SENSITIVE_RE = re.compile(r"password|secret|token|passcode|otp", re.IGNORECASE)
+# Anything with an "@" and no space reads as an e-mail address
+_EMAIL_HINT = re.compile(r"[^ @]*@[^ ]*")
+
+
+def _mask_sensitive(value: Optional[str]) -> Optional[str]:
   if value is None:
     return None
   s = str(value)
-  low = s.lower()
-  if any(tok in low for tok in ("password", "secret", "token", "otp")):
+  if _SENSITIVE_RE.search(s):
     return "********"
-  if "@" in s and " " not in s:
+  if _EMAIL_HINT.fullmatch(s):
     return "<email>"
   return s if len(s) <= 64 else f"{s[:8]}...{s[-4:]}"
 
@@ -73,6 +101,10 @@ def _signal_name(signum: int) -> str:
 
 def _install_signal_handlers(stop_event: threading.Event) -> List[Tuple[int, Any]]:
   installed: List[Tuple[int, Any]] = []
+  # Only the main thread may install handlers; pooled/worker callers stop
+  # the session through stop_event instead.
+  if threading.current_thread() is not threading.main_thread():
+    return installed
 
   def _handler(received_signum: int, frame: Optional[FrameType]) -> None:  # noqa: ARG001
     if not stop_event.is_set():
@@ -124,15 +156,44 @@ PAGE_INJECT_SCRIPT = """
   const captureQueue = [];
   const contextQueue = [];
 
+  // Captures cross the binding in arrays: up to BATCH_MAX events, held at
+  // most BATCH_MS so keystroke bursts become a single call
+  const BATCH_MAX = 32;
+  const BATCH_MS = 50;
+  let batchTimer = null;
+
   const flushQueues = () => {
-    while (captureQueue.length && deliver("pythonRecorderCapture", captureQueue[0])) {
-      captureQueue.shift();
+    if (batchTimer !== null) {
+      clearTimeout(batchTimer);
+      batchTimer = null;
+    }
+    while (captureQueue.length) {
+      const batch = captureQueue.slice(0, BATCH_MAX);
+      if (!deliver("pythonRecorderCapture", batch)) break;
+      captureQueue.splice(0, batch.length);
     }
     while (contextQueue.length && deliver("pythonRecorderPageContext", contextQueue[0])) {
       contextQueue.shift();
     }
   };
-  setInterval(flushQueues, 200);
+
+  // Edge-triggered: flush on a microtask when something is queued, and only
+  // retry (idle callback, else 50ms timer) while the bindings are not there yet
+  const retryLater = window.requestIdleCallback
+    ? (cb) => window.requestIdleCallback(cb, { timeout: 50 })
+    : (cb) => setTimeout(cb, 50);
+  let flushScheduled = false;
+  const scheduleFlush = () => {
+    if (flushScheduled) return;
+    flushScheduled = true;
+    queueMicrotask(() => {
+      flushScheduled = false;
+      flushQueues();
+      if (captureQueue.length || contextQueue.length) {
+        retryLater(scheduleFlush);
+      }
+    });
+  };
 
   const normaliseTarget = (raw) => {
     if (!raw) return null;
@@ -150,8 +211,22 @@ PAGE_INJECT_SCRIPT = """
     return String(value).trim().slice(0, limit);
   };
 
-  const buildXPath = (el) => {
+  // Per-element path caches: input/keydown events re-target the same node.
+  // Reset whenever the tree changes (see pathCacheObserver below).
+  let xpathCache = new WeakMap();
+  let cssCache = new WeakMap();
+  const cached = (cacheOf, compute) => (el) => {
     if (!el || el.nodeType !== 1) return "";
+    const cache = cacheOf();
+    let value = cache.get(el);
+    if (value === undefined) {
+      value = compute(el);
+      cache.set(el, value);
+    }
+    return value;
+  };
+
+  const buildXPath = cached(() => xpathCache, (el) => {
     const segments = [];
     let node = el;
     while (node && node.nodeType === 1) {
@@ -160,16 +235,17 @@ PAGE_INJECT_SCRIPT = """
         segments.unshift(node.nodeName.toLowerCase());
         break;
       }
-      const siblings = Array.from(parent.children).filter((child) => child.nodeName === node.nodeName);
-      const index = siblings.indexOf(node) + 1;
+      let index = 1;
+      for (let sib = node.previousElementSibling; sib; sib = sib.previousElementSibling) {
+        if (sib.nodeName === node.nodeName) index++;
+      }
       segments.unshift(`${node.nodeName.toLowerCase()}[${index}]`);
       node = parent.nodeType === 1 ? parent : null;
     }
     return "/" + segments.join("/");
-  };
+  });
 
-  const buildCssPath = (el) => {
-    if (!el || el.nodeType !== 1) return "";
+  const buildCssPath = cached(() => cssCache, (el) => {
     const parts = [];
     let node = el;
     while (node && node.nodeType === 1) {
@@ -180,22 +256,54 @@ PAGE_INJECT_SCRIPT = """
       }
       const parent = node.parentNode;
       if (!parent) break;
-      const index = Array.from(parent.children).indexOf(node) + 1;
+      let index = 1;
+      for (let sib = node.previousElementSibling; sib; sib = sib.previousElementSibling) index++;
       parts.unshift(`${node.nodeName.toLowerCase()}:nth-child(${index})`);
       node = parent;
     }
     return parts.join(" > ");
+  });
+
+  const resetPathCaches = () => {
+    xpathCache = new WeakMap();
+    cssCache = new WeakMap();
   };
 
-  const snapshot = (raw) => {
-    const el = normaliseTarget(raw);
-    if (!el) return null;
+  // Inserting or removing nodes shifts sibling indexes and id changes alter
+  // CSS paths, including SPA route changes that never fire load events.
+  // Records arrive batched per microtask, so a busy page costs one reset per batch.
+  try {
+    const pathCacheObserver = new MutationObserver(resetPathCaches);
+    pathCacheObserver.observe(document, {
+      childList: true,
+      subtree: true,
+      attributes: true,
+      attributeFilter: ["id"],
+    });
+  } catch (_) {}
+
+  // getBoundingClientRect forces layout; repeat hits on one element within
+  // RECT_TTL_MS (double clicks, Enter after typing) reuse the last box
+  const RECT_TTL_MS = 100;
+  const rectCache = new WeakMap();
+  const elementRect = (el) => {
+    const now = Date.now();
+    const hit = rectCache.get(el);
+    if (hit && now - hit.at < RECT_TTL_MS) return hit.rect;
     let rect = null;
     try {
       rect = el.getBoundingClientRect();
     } catch (_) {
       rect = null;
     }
+    rectCache.set(el, { rect, at: now });
+    return rect;
+  };
+
+  const snapshot = (raw, includeRect = true) => {
+    const el = normaliseTarget(raw);
+    if (!el) return null;
+    const rect = includeRect ? elementRect(el) : null;
     return {
       tag: (el.tagName || "").toLowerCase(),
       id: safeText(el.id, 80),
@@ -203,23 +311,33 @@ PAGE_INJECT_SCRIPT = """
       text: safeText(el.textContent, 120),
       xpath: buildXPath(el),
       cssPath: buildCssPath(el),
+      // Viewport-relative box plus the scroll offset, so Python can build a
+      // document-relative CDP clip without another round-trip
       rect: rect
-        ? { x: rect.x, y: rect.y, width: rect.width, height: rect.height }
+        ? { x: rect.x, y: rect.y, width: rect.width, height: rect.height, scrollX: window.scrollX, scrollY: window.scrollY }
         : null,
     };
   };
 
+  // Text entry is batched; discrete actions (click, change, press) flush
+  // right away, carrying any pending input events with them in order
   const queueCapture = (action, target, extra = {}) => {
-    const payload = {
+    captureQueue.push({
       action,
       pageUrl: location.href,
       pageTitle: document.title,
       timestamp: Date.now(),
-      element: snapshot(target),
+      // Keystrokes skip layout; the field's box rides on the change event
+      element: snapshot(target, action !== "input"),
       extra,
-    };
-    if (!deliver("pythonRecorderCapture", payload)) {
-      captureQueue.push(payload);
+    });
+    if (action !== "input" || captureQueue.length >= BATCH_MAX) {
+      scheduleFlush();
+    } else if (batchTimer === null) {
+      batchTimer = setTimeout(() => {
+        batchTimer = null;
+        scheduleFlush();
+      }, BATCH_MS);
     }
   };
 
@@ -232,6 +350,7 @@ PAGE_INJECT_SCRIPT = """
     };
     if (!deliver("pythonRecorderPageContext", payload)) {
       contextQueue.push(payload);
+      scheduleFlush();
     }
   };
 
@@ -282,12 +401,22 @@ PAGE_INJECT_SCRIPT = """
     true
   );
 
-document.addEventListener("DOMContentLoaded", () => queueContext("domcontentloaded"));
-window.addEventListener("load", () => queueContext("load"));
+document.addEventListener("DOMContentLoaded", () => { queueContext("domcontentloaded"); scheduleFlush(); });
+window.addEventListener("load", () => { queueContext("load"); scheduleFlush(); });
+// Hand over batched input before the document goes away
+window.addEventListener("pagehide", () => { flushQueues(); });
 queueContext("init");
 })();
 """
 
+# Serializes just the captured element when the whole document is too large
+ELEMENT_OUTER_HTML_SCRIPT = """
+(xp) => {
+  const node = document.evaluate(xp, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+  return node && node.outerHTML ? node.outerHTML : null;
+}
+"""
+
 # ------------------------------ Core flow ---------------------------
 def _ensure_playwright() -> Playwright:
   try:
@@ -296,40 +425,241 @@ def _ensure_playwright() -> Playwright:
     raise RuntimeError("Failed to start Playwright. Ensure browsers are installed: `python -m playwright install chromium`." ) from exc
 
 
-def _build_context(
-  playwright: Playwright,
-  browser_name: str,
-  headless: bool,
-  slow_mo: Optional[int],
-  har_path: Optional[Path],
-  ignore_https_errors: bool,
-  user_agent: Optional[str],
-) -> BrowserContext:
-  normalized = normalize_browser_name(browser_name, SUPPORTED_BROWSERS)
-  browser_factory = getattr(playwright, normalized)
-  browser: Browser = browser_factory.launch(headless=headless, slow_mo=slow_mo)
-  ctx_kwargs: Dict[str, Any] = {"ignore_https_errors": ignore_https_errors}
-  if har_path:
-    ctx_kwargs.update(record_har_path=str(har_path), record_har_mode="minimal")
-  if user_agent:
-    ctx_kwargs["user_agent"] = user_agent
-  return browser.new_context(**ctx_kwargs)
-
-
-def _await_user(timeout: Optional[int], stop_event: threading.Event) -> None:
-  start = time.time()
+def _await_user(context: BrowserContext, timeout: Optional[int], stop_event: threading.Event) -> None:
+  # The sync API only dispatches binding callbacks while this thread is inside
+  # a Playwright call; time.sleep would hold every capture until shutdown.
+  deadline = time.monotonic() + timeout if timeout else None
   try:
     while not stop_event.is_set():
-      time.sleep(0.2)
-      if timeout and time.time() - start >= timeout:
+      if deadline is not None and time.monotonic() >= deadline:
         print(f"[recorder] Auto-stopping after {timeout} seconds.")
         stop_event.set()
         break
+      pages = [p for p in context.pages if not p.is_closed()]
+      if not pages:
+        stop_event.wait(0.2)
+        continue
+      try:
+        pages[-1].wait_for_timeout(200)
+      except Exception:
+        # Page closed mid-wait; pick another one on the next pass
+        pass
   except KeyboardInterrupt:
     print("\n[recorder] Stopping (Ctrl+C detected).")
     stop_event.set()
 
 
+class RecorderEngine:
+  """Owns one Playwright driver and browser; each session gets a fresh context.
+
+  Launching Chromium dominates recorder start-up, while contexts are cheap and
+  isolated. Callers recording several sessions keep one engine alive and call
+  :meth:`record` (or :meth:`acquire`) repeatedly. Playwright's sync API is bound
+  to the thread that started it, so an engine must stay on a single thread.
+  """
+
+  def __init__(self) -> None:
+    self._playwright: Optional[Playwright] = None
+    self._browser: Optional[Browser] = None
+    self._launch_key: Optional[Tuple[str, bool, Optional[int]]] = None
+    self._active = 0
+
+  def _ensure_browser(self, browser_name: str, headless: bool, slow_mo: Optional[int]) -> Browser:
+    key = (normalize_browser_name(browser_name, SUPPORTED_BROWSERS), headless, slow_mo)
+    browser = self._browser
+    if browser is not None and browser.is_connected() and self._launch_key == key:
+      return browser
+    if browser is not None and self._active:
+      raise RuntimeError("RecorderEngine: a session is still running with different launch options.")
+    self._close_browser()
+    if self._playwright is None:
+      self._playwright = _ensure_playwright()
+    self._browser = getattr(self._playwright, key[0]).launch(headless=headless, slow_mo=slow_mo)
+    self._launch_key = key
+    return self._browser
+
+  def acquire(
+    self,
+    browser_name: str,
+    headless: bool,
+    slow_mo: Optional[int],
+    har_path: Optional[Path],
+    ignore_https_errors: bool,
+    user_agent: Optional[str],
+  ) -> Tuple[BrowserContext, Callable[[], None]]:
+    """Return a new context on the shared browser and a release callback."""
+    browser = self._ensure_browser(browser_name, headless, slow_mo)
+    ctx_kwargs: Dict[str, Any] = {"ignore_https_errors": ignore_https_errors}
+    if har_path:
+      ctx_kwargs.update(record_har_path=str(har_path), record_har_mode="minimal")
+    if user_agent:
+      ctx_kwargs["user_agent"] = user_agent
+    context = browser.new_context(**ctx_kwargs)
+    self._active += 1
+    released = False
+
+    def release() -> None:
+      nonlocal released
+      if released:
+        return
+      released = True
+      try:
+        context.close()
+      except Exception:
+        pass
+      self._active -= 1
+
+    return context, release
+
+  def _close_browser(self) -> None:
+    browser, self._browser = self._browser, None
+    self._launch_key = None
+    try:
+      if browser and browser.is_connected():
+        browser.close()
+    except Exception:
+      pass
+
+  def close(self) -> None:
+    """Close the browser and stop Playwright."""
+    self._close_browser()
+    playwright, self._playwright = self._playwright, None
+    try:
+      if playwright is not None:
+        playwright.stop()
+    except Exception:
+      pass
+
+  def record(self, args: argparse.Namespace) -> None:
+    """Run one recording session described by parsed CLI ``args``."""
+    # Session dirs
+    output_root = Path(args.output_dir).resolve()
+    output_root.mkdir(parents=True, exist_ok=True)
+    session_name = args.session_name or datetime.now().strftime("%Y%m%d_%H%M%S")
+    session_dir = output_root / session_name
+    session_dir.mkdir(parents=True, exist_ok=True)
+
+    stop_event = threading.Event()
+    handlers = _install_signal_handlers(stop_event)
+
+    har_path = None if args.no_har else session_dir / "network.har"
+    trace_path = None if args.no_trace else session_dir / "trace.zip"
+
+    print(f"[recorder] Session directory: {session_dir}")
+    print(f"[recorder] Launching browser ({args.browser}) at {args.url}")
+    if args.timeout:
+      print(f"[recorder] Will auto-stop after {args.timeout} seconds or Ctrl+C.")
+    else:
+      print("[recorder] Press Ctrl+C to stop recording.")
+
+    context: Optional[BrowserContext] = None
+    release: Optional[Callable[[], None]] = None
+    trace_started = False
+    finalized = False
+
+    # Prepare session
+    session = RecorderSession(
+      session_dir=session_dir,
+      capture_dom=args.capture_dom,
+      capture_screenshots=args.capture_screenshots,
+      stop_event=stop_event,
+      options={
+        "browser": args.browser,
+        "headless": args.headless,
+        "slowMo": args.slow_mo,
+        "captureDom": args.capture_dom,
+        "captureScreenshots": args.capture_screenshots,
+        "recordHar": not args.no_har,
+        "recordTrace": not args.no_trace,
+        "url": args.url,
+        "ignoreHttpsErrors": args.ignore_https_errors,
+        "userAgent": args.user_agent,
+        "blockMedia": args.block_media,
+      },
+    )
+
+    try:
+      context, release = self.acquire(
+        browser_name=args.browser,
+        headless=args.headless,
+        slow_mo=args.slow_mo,
+        har_path=har_path,
+        ignore_https_errors=args.ignore_https_errors,
+        user_agent=args.user_agent,
+      )
+
+      # Bindings BEFORE any navigation
+      context.expose_binding("pythonRecorderCapture", session.handle_capture)
+      context.expose_binding("pythonRecorderPageContext", session.handle_page_context)
+      context.add_init_script(PAGE_INJECT_SCRIPT)
+
+      if args.block_media:
+        context.route("**/*", _route_block_media)
+
+      # Diagnostics
+      context.on("requestfailed", lambda req: sys.stderr.write(f"[recorder][requestfailed] {req.url} -> {getattr(req, 'failure', lambda: '')()}\n"))
+
+      page = context.new_page()
+      if args.verbose_console:
+        page.on("console", _on_console)
+      page.on("pageerror", _on_page_error)
+
+      # Trace
+      if trace_path is not None:
+        try:
+          context.tracing.start(screenshots=True, snapshots=True, sources=True)
+          trace_started = True
+        except Exception as exc:  # noqa: BLE001
+          sys.stderr.write(f"[recorder] Failed to start tracing: {exc}\n")
+
+      # Navigate
+      page.goto(args.url, wait_until="domcontentloaded")
+
+      _await_user(context, args.timeout, stop_event)
+
+      # Stop trace if active
+      if trace_started and trace_path is not None:
+        try:
+          context.tracing.stop(path=str(trace_path))
+        except Exception as exc:  # noqa: BLE001
+          sys.stderr.write(f"[recorder] Failed to stop tracing: {exc}\n")
+
+      # Closing the context flushes the HAR; the browser stays up for the next session
+      release()
+
+      meta_path = session.finalize(har_path=har_path, trace_path=trace_path)
+      finalized = True
+      print(f"[recorder] Recorded {len(session.actions)} actions.")
+      print(f"[recorder] Metadata saved to {meta_path}")
+      if har_path and har_path.exists():
+        print(f"[recorder] HAR saved to {har_path}")
+      if trace_path and trace_path.exists():
+        print(f"[recorder] Trace saved to {trace_path}")
+      if args.capture_dom:
+        print(f"[recorder] DOM snapshots: {session.dom_count} file(s)")
+      if args.capture_screenshots:
+        print(f"[recorder] Screenshots: {session.screenshot_count} file(s)")
+
+    except KeyboardInterrupt:
+      stop_event.set()
+      sys.stderr.write("[recorder] Interrupt received. Cleaning up...\n")
+      if not finalized:
+        session.emergency_snapshot("interrupted")
+    except Exception as exc:  # noqa: BLE001
+      stop_event.set()
+      sys.stderr.write(f"[recorder] Unexpected error: {exc}\n")
+      if not finalized:
+        session.emergency_snapshot(f"error: {exc}")
+      raise
+    finally:
+      # The I/O worker is a daemon; drain it on every exit path so queued
+      # screenshots, DOM files and log lines referenced by metadata land on disk
+      session._stop_io()
+      if release is not None:
+        release()
+      _restore_signal_handlers(handlers)
+
+
 def main() -> None:
   parser = argparse.ArgumentParser(description="Open a browser and record rich UI metadata.")
   parser.add_argument("--url", required=True, help="Initial URL to open.")
@@ -345,6 +675,8 @@ def main() -> None:
   parser.add_argument("--capture-screenshots", action="store_true", help="Capture screenshots for actions.")
   parser.add_argument("--ignore-https-errors", action="store_true", help="Skip TLS certificate validation.")
   parser.add_argument("--user-agent", default=DEFAULT_USER_AGENT, help="Override browser User-Agent.")
+  parser.add_argument("--verbose-console", action="store_true", help="Echo the page's console messages to stderr.")
+  parser.add_argument("--block-media", action="store_true", help="Abort image/font/media requests (smaller HAR, faster loads).")
 
   args = parser.parse_args()
 
@@ -354,133 +686,11 @@ def main() -> None:
   except ValueError as exc:
     parser.error(str(exc))
 
-  # Session dirs
-  output_root = Path(args.output_dir).resolve()
-  output_root.mkdir(parents=True, exist_ok=True)
-  session_name = args.session_name or datetime.now().strftime("%Y%m%d_%H%M%S")
-  session_dir = output_root / session_name
-  session_dir.mkdir(parents=True, exist_ok=True)
-
-  stop_event = threading.Event()
-  handlers = _install_signal_handlers(stop_event)
-
-  har_path = None if args.no_har else session_dir / "network.har"
-  trace_path = None if args.no_trace else session_dir / "trace.zip"
-
-  print(f"[recorder] Session directory: {session_dir}")
-  print(f"[recorder] Launching browser ({args.browser}) at {args.url}")
-  if args.timeout:
-    print(f"[recorder] Will auto-stop after {args.timeout} seconds or Ctrl+C.")
-  else:
-    print("[recorder] Press Ctrl+C to stop recording.")
-
-  playwright = _ensure_playwright()
-  context: Optional[BrowserContext] = None
-  browser: Optional[Browser] = None
-  trace_started = False
-
-  # Prepare session
-  session = RecorderSession(
-    session_dir=session_dir,
-    capture_dom=args.capture_dom,
-    capture_screenshots=args.capture_screenshots,
-    options={
-      "browser": args.browser,
-      "headless": args.headless,
-      "slowMo": args.slow_mo,
-      "captureDom": args.capture_dom,
-      "captureScreenshots": args.capture_screenshots,
-      "recordHar": not args.no_har,
-      "recordTrace": not args.no_trace,
-      "url": args.url,
-      "ignoreHttpsErrors": args.ignore_https_errors,
-      "userAgent": args.user_agent,
-    },
-  )
-
+  engine = RecorderEngine()
   try:
-    context = _build_context(
-      playwright=playwright,
-      browser_name=args.browser,
-      headless=args.headless,
-      slow_mo=args.slow_mo,
-      har_path=har_path,
-      ignore_https_errors=args.ignore_https_errors,
-      user_agent=args.user_agent,
-    )
-    browser = context.browser
-
-    # Bindings BEFORE any navigation
-    context.expose_binding("pythonRecorderCapture", lambda source, payload: _on_capture(session, source, payload, args))
-    context.expose_binding("pythonRecorderPageContext", lambda source, payload: _on_page_context(session, source, payload))
-    context.add_init_script(PAGE_INJECT_SCRIPT)
-
-    # Diagnostics
-    context.on("requestfailed", lambda req: sys.stderr.write(f"[recorder][requestfailed] {req.url} -> {getattr(req, 'failure', lambda: '')()}\n"))
-
-    page = context.new_page()
-    page.on("console", _on_console)
-    page.on("pageerror", _on_page_error)
-
-    # Trace
-    if trace_path is not None:
-      try:
-        context.tracing.start(screenshots=True, snapshots=True, sources=True)
-        trace_started = True
-      except Exception as exc:  # noqa: BLE001
-        sys.stderr.write(f"[recorder] Failed to start tracing: {exc}\n")
-
-    # Navigate
-    page.goto(args.url, wait_until="domcontentloaded")
-
-    _await_user(args.timeout, stop_event)
-
-    # Stop trace if active
-    if trace_started and trace_path is not None:
-      try:
-        context.tracing.stop(path=str(trace_path))
-      except Exception as exc:  # noqa: BLE001
-        sys.stderr.write(f"[recorder] Failed to stop tracing: {exc}\n")
-
-    context.close()
-    browser.close()
-    playwright.stop()
-
-    meta_path = session.finalize(har_path=har_path, trace_path=trace_path)
-    print(f"[recorder] Recorded {len(session.actions)} actions.")
-    print(f"[recorder] Metadata saved to {meta_path}")
-    if har_path and har_path.exists():
-      print(f"[recorder] HAR saved to {har_path}")
-    if trace_path and trace_path.exists():
-      print(f"[recorder] Trace saved to {trace_path}")
-    if args.capture_dom:
-      print(f"[recorder] DOM snapshots: {len(list((session.dom_dir).glob('*.html')))} file(s)")
-    if args.capture_screenshots:
-      print(f"[recorder] Screenshots: {len(list((session.screenshot_dir).glob('*.png')))} file(s)")
-
-  except KeyboardInterrupt:
-    stop_event.set()
-    sys.stderr.write("[recorder] Interrupt received. Cleaning up...\n")
-  except Exception as exc:  # noqa: BLE001
-    stop_event.set()
-    sys.stderr.write(f"[recorder] Unexpected error: {exc}\n")
-    raise
+    engine.record(args)
   finally:
-    try:
-      if context and not context.is_closed():
-        context.close()
-    except Exception:
-      pass
-    try:
-      if browser and browser.is_connected():
-        browser.close()
-    except Exception:
-      pass
-    try:
-      playwright.stop()
-    except Exception:
-      pass
-    _restore_signal_handlers(handlers)
+    engine.close()
 
 
 # ------------------------------- Callbacks --------------------------
@@ -498,96 +708,25 @@ def _on_page_error(exc: Exception) -> None:
     pass
 
 
-def _on_page_context(session: RecorderSession, source: Any, payload: Dict[str, Any]) -> None:
-  session.add_page_event(payload)
-
-
-def _on_capture(session: RecorderSession, source: Any, payload: Dict[str, Any], args: argparse.Namespace) -> None:
-  """Process an element capture event from the page (called via expose_binding)."""
-  record = dict(payload or {})
-
-  # Optional DOM snapshot
-  if args.capture_dom:
-    try:
-      frame = getattr(source, "frame", None)
-      html = None
-      scope = "page"
-      if frame is not None:
-        try:
-          html = frame.content()
-          scope = "frame"
-        except Exception:
-          html = None
-      if html is None:
-        page = getattr(source, "page", None)
-        if page is not None:
-          try:
-            html = page.content()
-            scope = "page"
-          except Exception:
-            html = None
-      if html:
-        idx = len(session.actions) + 1
-        dom_path = session.dom_dir / f"A-{idx:03}.html"
-        dom_path.write_text(html, encoding="utf-8")
-        record["domSnapshotPath"] = str(dom_path.relative_to(session.session_dir))
-        record["domSnapshotScope"] = scope
-    except Exception as exc:  # noqa: BLE001
-      record["domSnapshotError"] = str(exc)
-
-  # Optional screenshot
-  if args.capture_screenshots:
-    try:
-      page = getattr(source, "page", None)
-      if page and not page.is_closed():
-        idx = len(session.actions) + 1
-        shot_path = session.screenshot_dir / f"A-{idx:03}.png"
-        clip = None
-        element_rect = ((record.get("element") or {}).get("rect") or None)
-        if element_rect and all(k in element_rect for k in ("x", "y", "width", "height")):
-          clip = {
-            "x": max(0, float(element_rect.get("x", 0))),
-            "y": max(0, float(element_rect.get("y", 0))),
-            "width": max(1, float(element_rect.get("width", 1))),
-            "height": max(1, float(element_rect.get("height", 1))),
-          }
-        try:
-          if clip:
-            page.screenshot(path=str(shot_path), clip=clip)
-          else:
-            page.screenshot(path=str(shot_path), full_page=True)
-          record["screenshotPath"] = str(shot_path.relative_to(session.session_dir))
-        except Exception:
-          # Fallback to full-page on any clip error
-          page.screenshot(path=str(shot_path), full_page=True)
-          record["screenshotPath"] = str(shot_path.relative_to(session.session_dir))
-    except Exception as exc:  # noqa: BLE001
-      record["screenshotError"] = str(exc)
-
-  session.add_action(record)
-
-
- 
-def _iso_now() -> str:
-    return datetime.now(timezone.utc).isoformat()
-
-
-def _mask_sensitive(value: Optional[str]) -> Optional[str]:
-    if value is None:
-        return None
-    text = str(value)
-    lowered = text.lower()
-    sensitive_tokens = ("password", "secret", "token", "passcode", "otp")
-    if any(token in lowered for token in sensitive_tokens):
-        return "********"
-    if "@" in text and " " not in text:
-        return "<email>"
-    if len(text) > 64:
-        return f"{text[:8]}...{text[-4:]}"
-    return text
+def _route_block_media(route: Route) -> None:
+  if route.request.resource_type in BLOCKED_MEDIA_TYPES:
+    route.abort()
+  else:
+    route.continue_()
 
 
 class RecorderSession:
+    # Seconds between metadata.json checkpoints while recording
+    CHECKPOINT_INTERVAL = 5.0
+    # Element clips are JPEG; only the full-page fallback stays PNG
+    SCREENSHOT_JPEG_QUALITY = 75
+    # Larger clips go through page.screenshot; CDP shines on small elements
+    CDP_CLIP_MAX_EDGE = 1024
+    # Pending artifact/log writes before the binding callback has to wait
+    IO_QUEUE_SIZE = 256
+    # HTML snapshots above this size keep only the target element's subtree
+    MAX_DOM_BYTES = 4_000_000
+
     def __init__(
         self,
         session_dir: Path,
@@ -604,11 +743,21 @@ class RecorderSession:
         self.actions: List[Dict[str, Any]] = []
         self.page_events: List[Dict[str, Any]] = []
         self.action_counter = 0
+        self.dom_count = 0
+        self.screenshot_count = 0
         self.started_at = _iso_now()
         self.screenshot_dir = self.session_dir / "screenshots"
         self.dom_dir = self.session_dir / "dom"
+        # Per-action artifact paths are joined as strings, not Path operations
+        self._session_prefix = str(self.session_dir) + os.sep
+        self._screenshot_rel = "screenshots" + os.sep
+        self._dom_rel = "dom" + os.sep
         self._page_lock = threading.Lock()
         self._pages: Dict[int, Page] = {}
+        # Page key -> CDP session (None once a page is known not to support CDP)
+        self._cdp_sessions: Dict[int, Optional[CDPSession]] = {}
+        # Page key -> document title, dropped whenever the main frame navigates
+        self._title_cache: Dict[int, str] = {}
         self._last_page_id: Optional[int] = None
         self._metadata_lock = threading.Lock()
         self._ended_at: Optional[str] = None
@@ -619,7 +768,22 @@ class RecorderSession:
             self.screenshot_dir.mkdir(parents=True, exist_ok=True)
         if self.capture_dom:
             self.dom_dir.mkdir(parents=True, exist_ok=True)
+        # Append-only logs; metadata.json is only rebuilt by checkpoints and finalize()
+        self._actions_fp = (self.session_dir / "actions.jsonl").open("a", encoding="utf-8", buffering=1 << 16)
+        self._events_fp = (self.session_dir / "page_events.jsonl").open("a", encoding="utf-8", buffering=1 << 16)
+        self._dirty = False
+        self._checkpoint_timer: Optional[threading.Timer] = None
+        # Playwright calls must stay on the callback thread; encoding and disk
+        # writes go to one FIFO worker so the callback returns quickly and
+        # the JSONL logs keep their order
+        self._io_queue: "queue.Queue[Optional[Tuple[Callable[..., None], Tuple[Any, ...]]]]" = queue.Queue(
+            maxsize=self.IO_QUEUE_SIZE
+        )
+        self._io_full_warned = False
+        self._io_thread = threading.Thread(target=self._io_worker, name="recorder-io", daemon=True)
+        self._io_thread.start()
         self._persist_metadata()
+        self._schedule_checkpoint()
 
     def _build_summary(self) -> Dict[str, Any]:
         summary: Dict[str, Any] = {
@@ -636,14 +800,112 @@ class RecorderSession:
             summary["session"]["endedAt"] = self._ended_at
         return summary
 
-    def _persist_metadata(self) -> None:
+    def _persist_metadata(self, pretty: bool = False) -> None:
         with self._metadata_lock:
             summary = self._build_summary()
             try:
-                self.metadata_path.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+                self.metadata_path.write_bytes(_dump_json(summary, pretty))
             except Exception as exc:  # noqa: BLE001
                 sys.stderr.write(f"[recorder] Failed to persist metadata snapshot: {exc}\n")
 
+    # ---- Background I/O ---------------------------------------------------
+    def _io_worker(self) -> None:
+        while True:
+            item = self._io_queue.get()
+            try:
+                if item is None:
+                    return
+                func, args = item
+                try:
+                    func(*args)
+                except Exception as exc:  # noqa: BLE001
+                    sys.stderr.write(f"[recorder] Background write failed: {exc}\n")
+            finally:
+                self._io_queue.task_done()
+
+    def _submit_io(self, func: Callable[..., None], *args: Any) -> None:
+        if not self._io_thread.is_alive():
+            # Worker already stopped (late events after finalize): write inline
+            try:
+                func(*args)
+            except Exception as exc:  # noqa: BLE001
+                sys.stderr.write(f"[recorder] Write failed: {exc}\n")
+            return
+        try:
+            self._io_queue.put_nowait((func, args))
+        except queue.Full:
+            if not self._io_full_warned:
+                self._io_full_warned = True
+                sys.stderr.write("[recorder] Artifact writer is behind; captures will wait for it.\n")
+            # Block rather than drop: artifacts and log order are preserved
+            self._io_queue.put((func, args))
+
+    def _stop_io(self, timeout: Optional[float] = None) -> None:
+        if self._io_thread.is_alive():
+            self._io_queue.put(None)
+            self._io_thread.join(timeout)
+
+    @staticmethod
+    def _write_jsonl(fp: Any, record: Dict[str, Any]) -> None:
+        fp.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+    @staticmethod
+    def _write_bytes(path: str, data: bytes) -> None:
+        with open(path, "wb") as fh:
+            fh.write(data)
+
+    @staticmethod
+    def _write_b64(path: str, data: str) -> None:
+        with open(path, "wb") as fh:
+            fh.write(base64.b64decode(data))
+
+    @staticmethod
+    def _write_gzip(path: str, data: Any) -> None:
+        # Level 1: DOM text still shrinks several-fold at a fraction of the CPU
+        if not isinstance(data, (bytes, str)):
+            data = _dump_json(data)
+        elif isinstance(data, str):
+            data = data.encode("utf-8")
+        with gzip.open(path, "wb", compresslevel=1) as fh:
+            fh.write(data)
+
+    # Run on the I/O worker: artifacts are counted only once they are on disk
+    def _save_screenshot(self, write: Callable[[str, Any], None], path: str, data: Any) -> None:
+        write(path, data)
+        self.screenshot_count += 1
+
+    def _save_dom(self, path: str, data: Any) -> None:
+        self._write_gzip(path, data)
+        self.dom_count += 1
+
+    def _append_record(self, records: List[Dict[str, Any]], fp: Any, record: Dict[str, Any]) -> None:
+        with self._metadata_lock:
+            records.append(record)
+            self._dirty = True
+        self._submit_io(self._write_jsonl, fp, record)
+
+    def _schedule_checkpoint(self) -> None:
+        timer = threading.Timer(self.CHECKPOINT_INTERVAL, self._checkpoint)
+        timer.daemon = True
+        self._checkpoint_timer = timer
+        timer.start()
+
+    def _checkpoint(self) -> None:
+        if self._ended_at:
+            return
+        if self._dirty:
+            self._dirty = False
+            # Queued behind the pending lines, so the JSONL logs on disk are at
+            # least as current as the metadata written next
+            self._submit_io(self._flush_logs)
+            self._persist_metadata()
+        self._schedule_checkpoint()
+
+    def _flush_logs(self) -> None:
+        for fp in (self._actions_fp, self._events_fp):
+            if not fp.closed:
+                fp.flush()
+
     @staticmethod
     def _page_key(page: Page) -> int:
         return id(page)
@@ -653,8 +915,24 @@ class RecorderSession:
             return
         key = self._page_key(page)
         with self._page_lock:
+            is_new = key not in self._pages
             self._pages[key] = page
             self._last_page_id = key
+        if is_new:
+            page.on("framenavigated", lambda frame: self._on_frame_navigated(page, frame))
+            page.on("close", self.unregister_page)
+
+    def _on_frame_navigated(self, page: Page, frame: Frame) -> None:
+        if frame == page.main_frame:
+            self._title_cache.pop(self._page_key(page), None)
+
+    def _page_title(self, page: Page) -> str:
+        """Return the page title, fetched over the wire once per navigation."""
+        key = self._page_key(page)
+        title = self._title_cache.get(key)
+        if title is None:
+            title = self._title_cache[key] = page.title()
+        return title
 
     def unregister_page(self, page: Optional[Page]) -> None:
         if page is None:
@@ -662,9 +940,42 @@ class RecorderSession:
         key = self._page_key(page)
         with self._page_lock:
             self._pages.pop(key, None)
+            self._cdp_sessions.pop(key, None)
+            self._title_cache.pop(key, None)
             if self._last_page_id == key:
                 self._last_page_id = next(iter(self._pages), None)
 
+    def _cdp_session(self, page: Optional[Page]) -> Optional[CDPSession]:
+        """Return a cached CDP session for ``page``; None on non-Chromium engines."""
+        if page is None or page.is_closed():
+            return None
+        key = self._page_key(page)
+        if key in self._cdp_sessions:
+            return self._cdp_sessions[key]
+        try:
+            cdp: Optional[CDPSession] = page.context.new_cdp_session(page)
+        except Exception:  # noqa: BLE001
+            cdp = None
+        self._cdp_sessions[key] = cdp
+        return cdp
+
+    @staticmethod
+    def _apply_dom_result(record: Dict[str, Any], dom_result: Optional[Dict[str, str]]) -> None:
+        if not dom_result:
+            return
+        dom_path = dom_result.get("path")
+        if dom_path:
+            record["domSnapshotPath"] = dom_path
+        scope = dom_result.get("scope")
+        if scope:
+            record["domSnapshotScope"] = scope
+        fmt = dom_result.get("format")
+        if fmt:
+            record["domSnapshotFormat"] = fmt
+        error = dom_result.get("error")
+        if error:
+            record.setdefault("domSnapshotError", error)
+
     def _resolve_page(self, source: Any) -> Optional[Page]:
         candidate = getattr(source, "page", None)
         if candidate:
@@ -695,8 +1006,7 @@ class RecorderSession:
                 queued_at_int = None
             if queued_at_int:
                 event["queuedAt"] = queued_at_int
-        self.page_events.append(event)
-        self._persist_metadata()
+        self._append_record(self.page_events, self._events_fp, event)
 
         page = self._resolve_page(source)
         frame = getattr(source, "frame", None)
@@ -713,9 +1023,16 @@ class RecorderSession:
             if needs_record:
                 self._record_navigation(event, page, frame)
                 self._last_navigation_url = url
-        self._persist_metadata()
 
-    def handle_capture(self, source: Any, payload: Dict[str, Any]) -> None:
+    def handle_capture(self, source: Any, payload: Any) -> None:
+        # The page delivers captures in batches (a list); single dicts still work
+        if isinstance(payload, list):
+            for item in payload:
+                self._record_capture(source, item)
+        else:
+            self._record_capture(source, payload)
+
+    def _record_capture(self, source: Any, payload: Dict[str, Any]) -> None:
         self.action_counter += 1
         action_id = f"A-{self.action_counter:03}"
 
@@ -749,8 +1066,10 @@ class RecorderSession:
         if self.stop_event.is_set():
             return
 
-        if self.capture_screenshots and page and not page.is_closed():
-            clip = record.get("boundingBox")
+        # Input events carry no rect; the change event that follows them is
+        # the one screenshotted
+        if self.capture_screenshots and page and not page.is_closed() and record.get("action") != "input":
+            clip = record.get("boundingBox") or element.get("rect")
             screenshot_result = self._capture_screenshot(page, action_id, clip)
             if screenshot_result:
                 screenshot_path, used_full_page = screenshot_result
@@ -759,17 +1078,7 @@ class RecorderSession:
                     record["screenshotFullPage"] = True
 
         if self.capture_dom and (page or frame) and not self.stop_event.is_set():
-            dom_result = self._capture_dom(page, frame, action_id)
-            if dom_result:
-                dom_path = dom_result.get("path")
-                if dom_path:
-                    record["domSnapshotPath"] = dom_path
-                scope = dom_result.get("scope")
-                if scope:
-                    record["domSnapshotScope"] = scope
-                error = dom_result.get("error")
-                if error:
-                    record.setdefault("domSnapshotError", error)
+            self._apply_dom_result(record, self._capture_dom(page, frame, action_id, element.get("xpath")))
 
         # Guarantee current page URL/title
         if page:
@@ -777,20 +1086,20 @@ class RecorderSession:
                 record.setdefault("pageUrl", record.get("pageUrl") or page.url)
             except Exception:
                 pass
-            try:
-                record.setdefault("pageTitle", record.get("pageTitle") or page.title())
-            except Exception:
-                pass
+            if not record.get("pageTitle"):
+                try:
+                    record["pageTitle"] = self._page_title(page)
+                except Exception:
+                    pass
         elif frame:
             try:
                 record.setdefault("pageUrl", record.get("pageUrl") or frame.url)
             except Exception:
                 pass
 
-        self.actions.append(record)
+        self._append_record(self.actions, self._actions_fp, record)
         # Helpful debug output
         sys.stderr.write(f"[recorder] captured {action_id} -> {record.get('action')}\n")
-        self._persist_metadata()
 
     def _record_navigation(
         self,
@@ -834,27 +1143,17 @@ class RecorderSession:
                     record["screenshotFullPage"] = True
 
         if self.capture_dom and (page or frame) and not self.stop_event.is_set():
-            dom_result = self._capture_dom(page, frame, action_id)
-            if dom_result:
-                dom_path = dom_result.get("path")
-                if dom_path:
-                    record["domSnapshotPath"] = dom_path
-                scope = dom_result.get("scope")
-                if scope:
-                    record["domSnapshotScope"] = scope
-                error = dom_result.get("error")
-                if error:
-                    record.setdefault("domSnapshotError", error)
-
-        self.actions.append(record)
+            self._apply_dom_result(record, self._capture_dom(page, frame, action_id))
+
+        self._append_record(self.actions, self._actions_fp, record)
         sys.stderr.write(f"[recorder] captured {action_id} -> navigate\n")
 
     def _capture_screenshot(
         self, page: Page, action_id: str, clip: Optional[Dict[str, Any]]
     ) -> Optional[Tuple[str, bool]]:
+        if page.is_closed():
+            return None
         try:
-            path = self.screenshot_dir / f"{action_id}.png"
-            used_full_page = False
             if clip and all(clip.get(key) not in (None, 0) for key in ("width", "height")):
                 clip_dict = {
                     "x": max(0, float(clip.get("x", 0))),
@@ -862,18 +1161,42 @@ class RecorderSession:
                     "width": max(1, float(clip.get("width", 1))),
                     "height": max(1, float(clip.get("height", 1))),
                 }
+                rel = f"{self._screenshot_rel}{action_id}.jpg"
+                path = self._session_prefix + rel
                 try:
-                    page.screenshot(path=str(path), clip=clip_dict)
+                    small = max(clip_dict["width"], clip_dict["height"]) <= self.CDP_CLIP_MAX_EDGE
+                    cdp = self._cdp_session(page) if small else None
+                    if cdp is not None:
+                        # CDP clips are document-relative; the page reported its scroll offset
+                        result = cdp.send(
+                            "Page.captureScreenshot",
+                            {
+                                "format": "jpeg",
+                                "quality": self.SCREENSHOT_JPEG_QUALITY,
+                                "captureBeyondViewport": False,
+                                "fromSurface": True,
+                                "clip": {
+                                    **clip_dict,
+                                    "x": clip_dict["x"] + float(clip.get("scrollX") or 0),
+                                    "y": clip_dict["y"] + float(clip.get("scrollY") or 0),
+                                    "scale": 1,
+                                },
+                            },
+                        )
+                        self._submit_io(self._save_screenshot, self._write_b64, path, result["data"])
+                    else:
+                        shot = page.screenshot(clip=clip_dict, type="jpeg", quality=self.SCREENSHOT_JPEG_QUALITY)
+                        self._submit_io(self._save_screenshot, self._write_bytes, path, shot)
+                    return rel, False
                 except Exception as clip_exc:  # noqa: BLE001
-                    used_full_page = True
                     sys.stderr.write(
                         f"[recorder] Element clip failed for {action_id}, falling back to full-page screenshot: {clip_exc}\n"
                     )
-                    page.screenshot(path=str(path), full_page=True)
-            else:
-                used_full_page = True
-                page.screenshot(path=str(path), full_page=True)
-            return str(path.relative_to(self.session_dir)), used_full_page
+            rel = f"{self._screenshot_rel}{action_id}.png"
+            self._submit_io(
+                self._save_screenshot, self._write_bytes, self._session_prefix + rel, page.screenshot(full_page=True)
+            )
+            return rel, True
         except KeyboardInterrupt:
             self.stop_event.set()
             sys.stderr.write(f"[recorder] Screenshot interrupted for {action_id}.\n")
@@ -887,10 +1210,33 @@ class RecorderSession:
         page: Optional[Page],
         frame: Optional[Frame],
         action_id: str,
+        xpath: Optional[str] = None,
     ) -> Optional[Dict[str, str]]:
+        errors: List[str] = []
+        # Chromium: DOMSnapshot returns the flattened document (all frames) as
+        # string tables + node arrays, without re-serializing it to HTML.
+        snapshot: Optional[Dict[str, Any]] = None
+        cdp = self._cdp_session(page)
+        if cdp is not None:
+            try:
+                snapshot = cdp.send(
+                    "DOMSnapshot.captureSnapshot",
+                    {"computedStyles": [], "includePaintOrder": False, "includeDOMRects": False},
+                )
+            except Exception as cdp_exc:  # noqa: BLE001
+                errors.append(f"cdp:{cdp_exc}")
+        if snapshot is not None:
+            rel = f"{self._dom_rel}{action_id}.json.gz"
+            self._submit_io(self._save_dom, self._session_prefix + rel, snapshot)
+            return {
+                "path": rel,
+                "scope": "page",
+                "format": "domsnapshot",
+            }
+
+        # Fallback: serialized HTML of the frame, else the page
         html: Optional[str] = None
         scope = "page"
-        errors: List[str] = []
         if frame is not None:
             try:
                 html = frame.content()
@@ -908,27 +1254,41 @@ class RecorderSession:
                 sys.stderr.write(f"[recorder] Failed to obtain DOM for {action_id}: {'; '.join(errors)}\n")
                 return {"error": "; ".join(errors)}
             return None
-        try:
-            path = self.dom_dir / f"{action_id}.html"
-            path.write_text(html, encoding="utf-8")
-            result: Dict[str, str] = {
-                "path": str(path.relative_to(self.session_dir)),
-                "scope": scope,
-            }
-            if errors:
-                result["error"] = "; ".join(errors)
-            return result
-        except KeyboardInterrupt:
-            self.stop_event.set()
-            sys.stderr.write(f"[recorder] DOM capture interrupted for {action_id}.\n")
-            return {"error": "interrupted"}
-        except Exception as exc:  # noqa: BLE001
-            sys.stderr.write(f"[recorder] Failed to capture DOM for {action_id}: {exc}\n")
-            combined_error = "; ".join(errors + [str(exc)]) if errors else str(exc)
-            return {"error": combined_error}
+        if len(html) > self.MAX_DOM_BYTES and xpath:
+            target = frame if scope == "frame" else page
+            try:
+                subtree = target.evaluate(ELEMENT_OUTER_HTML_SCRIPT, xpath) if target else None
+            except Exception as subtree_exc:  # noqa: BLE001
+                subtree = None
+                errors.append(f"subtree:{subtree_exc}")
+            if subtree:
+                html, scope = subtree, "element"
+        rel = f"{self._dom_rel}{action_id}.html.gz"
+        self._submit_io(self._save_dom, self._session_prefix + rel, html)
+        result: Dict[str, str] = {
+            "path": rel,
+            "scope": scope,
+            "format": "html",
+        }
+        if errors:
+            result["error"] = "; ".join(errors)
+        return result
+
+    def _close_logs(self) -> None:
+        with self._metadata_lock:
+            for fp in (self._actions_fp, self._events_fp):
+                try:
+                    fp.close()
+                except Exception:  # noqa: BLE001
+                    pass
 
     def finalize(self, har_path: Optional[Path], trace_path: Optional[Path]) -> Path:
         self._ended_at = _iso_now()
+        if self._checkpoint_timer is not None:
+            self._checkpoint_timer.cancel()
+        # Let queued artifacts and log lines land before the final metadata
+        self._stop_io()
+        self._close_logs()
         if har_path and har_path.exists():
             try:
                 self._artifacts["har"] = str(har_path.relative_to(self.session_dir))
@@ -939,77 +1299,29 @@ class RecorderSession:
                 self._artifacts["trace"] = str(trace_path.relative_to(self.session_dir))
             except Exception:
                 self._artifacts["trace"] = str(trace_path)
-        self._persist_metadata()
+        # Checkpoints stay compact; the final file is written once, readable
+        self._persist_metadata(pretty=True)
         return self.metadata_path
 
     def emergency_snapshot(self, reason: str) -> Optional[Path]:
         self._ended_at = self._ended_at or _iso_now()
+        if self._checkpoint_timer is not None:
+            self._checkpoint_timer.cancel()
+        self._stop_io(timeout=2.0)
+        self._close_logs()
         with self._metadata_lock:
             summary = self._build_summary()
             session_meta = summary.setdefault("session", {})
             session_meta.setdefault("status", "incomplete")
             session_meta["emergencyReason"] = reason
             try:
-                self.metadata_path.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+                self.metadata_path.write_bytes(_dump_json(summary, pretty=True))
                 return self.metadata_path
             except Exception as exc:  # noqa: BLE001
                 sys.stderr.write(f"[recorder] Failed to write emergency metadata snapshot: {exc}\n")
                 return None
 
 
-def _ensure_playwright() -> Playwright:
-    try:
-        return sync_playwright().start()
-    except Exception as exc:  # noqa: BLE001
-        raise RuntimeError("Failed to start Playwright. Ensure `playwright install` has been run.") from exc
-
-
-def _build_context(
-    playwright: Playwright,
-    browser_name: str,
-    headless: bool,
-    slow_mo: Optional[int],
-    har_path: Optional[Path],
-    ignore_https_errors: bool,
-    user_agent: Optional[str] = None,
-    proxy_server: Optional[str] = None,
-    launch_args: Optional[List[str]] = None,
-) -> BrowserContext:
-    normalized_name = normalize_browser_name(browser_name, SUPPORTED_BROWSERS)
-    browser_factory = getattr(playwright, normalized_name)
-    launch_kwargs: Dict[str, Any] = {"headless": headless, "slow_mo": slow_mo}
-    if proxy_server:
-        # Playwright expects a dict with server key
-        launch_kwargs["proxy"] = {"server": proxy_server}
-    if launch_args:
-        launch_kwargs["args"] = list(launch_args)
-    browser: Browser = browser_factory.launch(**launch_kwargs)
-    context_kwargs: Dict[str, Any] = {}
-    if har_path:
-        context_kwargs.update(
-            record_har_path=str(har_path),
-            record_har_mode="minimal",
-        )
-    if user_agent:
-        context_kwargs["user_agent"] = user_agent
-    context = browser.new_context(ignore_https_errors=ignore_https_errors, **context_kwargs)
-    return context
-
-
-def _await_user(timeout: Optional[int], stop_event: threading.Event) -> None:
-    start = time.time()
-    try:
-        while not stop_event.is_set():
-            time.sleep(0.2)
-            if timeout and time.time() - start >= timeout:
-                print(f"[recorder] Auto-stopping after {timeout} seconds.")
-                stop_event.set()
-                break
-    except KeyboardInterrupt:
-        print("\n[recorder] Stopping (Ctrl+C detected).")
-        stop_event.set()
-
-
 if __name__ == "__main__":
     # Allow graceful shutdown on Ctrl+C on Windows as well.
     try:
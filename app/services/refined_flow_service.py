@@ -8,8 +8,18 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+try:  # pragma: no cover - optional fast JSON
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
 from ..recorder_auto_ingest import auto_refine_and_ingest
 
+# Artefact patterns written by both recorders: v2 saves plain HTML/PNG, the v1
+# recorder gzips DOM captures (CDP snapshot JSON or HTML) and clips JPEG screenshots.
+DOM_PATTERNS = ("*.html", "*.html.gz", "*.json.gz")
+SCREENSHOT_PATTERNS = ("*.png", "*.jpg")
+
 
 @dataclass
 class RecorderSessionResult:
@@ -45,7 +55,9 @@ def load_recorder_metadata(session_dir: Path, attempts: int = 15, delay: float =
     for _ in range(max(attempts, 1)):
         if metadata_path.exists():
             try:
-                data = json.loads(metadata_path.read_text(encoding="utf-8"))
+                # Parse the raw bytes directly; both parsers accept UTF-8 input.
+                raw = metadata_path.read_bytes()
+                data = orjson.loads(raw) if orjson is not None else json.loads(raw)
                 # Ensure we return a dict, not a string
                 if not isinstance(data, dict):
                     print(f"[ERROR] metadata.json contains {type(data).__name__}, expected dict")
@@ -81,11 +93,11 @@ def scan_session_directory(session_dir: Path) -> Dict[str, Any]:
 
     dom_dir = session_path / "dom"
     if dom_dir.exists():
-        summary["dom_files"] = len(list(dom_dir.glob("*.html")))
+        summary["dom_files"] = sum(len(list(dom_dir.glob(pattern))) for pattern in DOM_PATTERNS)
 
     shots_dir = session_path / "screenshots"
     if shots_dir.exists():
-        summary["screenshot_files"] = len(list(shots_dir.glob("*.png")))
+        summary["screenshot_files"] = sum(len(list(shots_dir.glob(pattern))) for pattern in SCREENSHOT_PATTERNS)
 
     return summary
 
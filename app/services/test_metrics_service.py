@@ -2,11 +2,17 @@
 from __future__ import annotations
 
 import json
+import os
 import xml.etree.ElementTree as ET
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 from datetime import datetime
 
+try:  # pragma: no cover - optional fast JSON
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
 
 class TestMetricsService:
     """Extract and aggregate test metrics from Playwright reports."""
@@ -35,28 +41,30 @@ class TestMetricsService:
         if not self.framework_repos_path.exists():
             return []
 
-        all_reports = []
+        run_entries: List[os.DirEntry] = []
         
         # If no repo_id specified, find all reports across all repos
         if repo_id is None:
-            for repo_dir in self.framework_repos_path.iterdir():
-                if repo_dir.is_dir():
-                    report_dir = repo_dir / "report"
-                    if report_dir.exists():
-                        for run_dir in report_dir.iterdir():
-                            if run_dir.is_dir() and run_dir.name.startswith("run-"):
-                                all_reports.append(run_dir)
+            with os.scandir(self.framework_repos_path) as repos:
+                report_dirs = [os.path.join(repo.path, "report") for repo in repos if repo.is_dir()]
         else:
             # Find all reports for specific repo
-            repo_dir = self.framework_repos_path / repo_id / "report"
-            if repo_dir.exists():
-                for run_dir in repo_dir.iterdir():
-                    if run_dir.is_dir() and run_dir.name.startswith("run-"):
-                        all_reports.append(run_dir)
+            report_dirs = [os.path.join(self.framework_repos_path, repo_id, "report")]
+        
+        # scandir entries answer is_dir() from the directory listing, so
+        # non-run entries are skipped without a stat each
+        for report_dir in report_dirs:
+            try:
+                with os.scandir(report_dir) as runs:
+                    run_entries.extend(
+                        run for run in runs if run.name.startswith("run-") and run.is_dir()
+                    )
+            except (FileNotFoundError, NotADirectoryError):
+                continue
         
         # Sort by directory name (timestamp) - most recent first
-        all_reports.sort(key=lambda p: p.name, reverse=True)
-        return all_reports
+        run_entries.sort(key=lambda entry: entry.name, reverse=True)
+        return [Path(entry.path) for entry in run_entries]
 
     def get_latest_report(self, repo_id: Optional[str] = None) -> Optional[Path]:
         """
@@ -86,8 +94,8 @@ class TestMetricsService:
             return None
         
         try:
-            with open(report_json, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            raw = report_json.read_bytes()
+            return orjson.loads(raw) if orjson is not None else json.loads(raw)
         except Exception as e:
             print(f"Error parsing report.json: {e}")
             return None
@@ -5,15 +5,51 @@ import json
 import chromadb
 from chromadb.utils import embedding_functions
 import os
+import re
+
+_AGGREGATE_RE = re.compile(r"(max|min)\((\w+)\)")
+
+
+def _prefer(value, current, op: str) -> bool:
+    """True when `value` should replace `current` for a max/min aggregate."""
+    try:
+        return value > current if op == "max" else value < current
+    except TypeError:
+        # Mixed types (e.g. epoch int vs ISO string): compare as text
+        return str(value) > str(current) if op == "max" else str(value) < str(current)
+
+
+def store_version(path: str) -> tuple:
+    """Cheap change marker for the on-disk store at `path`, for keying read caches.
+
+    Every write from any process lands in chroma.sqlite3 (or its -wal file),
+    so their mtime and size change whenever the collection does.
+    """
+    base = os.path.join(path, "chroma.sqlite3")
+    stamp = []
+    for file_path in (base, base + "-wal"):
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            stamp.extend((0, 0))
+        else:
+            stamp.extend((st.st_mtime_ns, st.st_size))
+    return tuple(stamp)
+
 
 class VectorDBClient:
     def __init__(self, path: str = "./vector_store"):
+        self.path = path
         self.client = chromadb.PersistentClient(path=path)
         self.collection = self.client.get_or_create_collection(
             name="gen_ai",
             embedding_function=embedding_functions.DefaultEmbeddingFunction()
         )
 
+    def store_version(self) -> tuple:
+        """Change marker of this client's store (see module-level store_version)."""
+        return store_version(self.path)
+
     # ---------------- Add ----------------
     def add_document(self, source: str, doc_id: str, content: str, metadata: dict):
         # Ensure source is included in metadata
@@ -198,6 +234,77 @@ class VectorDBClient:
             })
         return docs
 
+    # ---------------- Aggregate metadata ----------------
+    def distinct_metadata(
+        self,
+        where: dict,
+        keys: tuple = ("flow_slug",),
+        aggregates: dict = None,
+        page_size: int = 500,
+    ):
+        """Group documents matching `where` by metadata `keys` without fetching content.
+
+        `aggregates` maps output names to "*" (document count), "max(field)" or
+        "min(field)" over a metadata field; the default is
+        {"count": "*", "latest": "max(timestamp)"}. Chroma has no group-by, so
+        grouping happens here, but only metadatas are requested, page by page,
+        over every matching document (no cap). Documents missing the first key
+        are skipped; a max/min is None when no document in the group has the field.
+        """
+        if aggregates is None:
+            aggregates = {"count": "*", "latest": "max(timestamp)"}
+        plan = []
+        for name, spec in aggregates.items():
+            if spec == "*":
+                plan.append((name, "count", None))
+                continue
+            match = _AGGREGATE_RE.fullmatch(spec)
+            if not match:
+                raise ValueError(f"Unsupported aggregate {name}={spec!r}")
+            plan.append((name, match.group(1), match.group(2)))
+
+        if where and len(where) > 1:
+            chroma_where = {"$and": [{k: v} for k, v in where.items()]}
+        else:
+            chroma_where = where or None
+
+        groups: dict = {}
+        offset = 0
+        while True:
+            results = self.collection.get(
+                where=chroma_where,
+                include=["metadatas"],
+                limit=page_size,
+                offset=offset,
+            )
+            metadatas = results.get("metadatas") or []
+            for meta in metadatas:
+                if not isinstance(meta, dict):
+                    continue
+                group_key = tuple(meta.get(k) for k in keys)
+                if not group_key[0]:
+                    continue
+                entry = groups.get(group_key)
+                if entry is None:
+                    entry = dict(zip(keys, group_key))
+                    for name, op, _ in plan:
+                        entry[name] = 0 if op == "count" else None
+                    groups[group_key] = entry
+                for name, op, field in plan:
+                    if op == "count":
+                        entry[name] += 1
+                        continue
+                    value = meta.get(field)
+                    if value is None or value == "":
+                        continue
+                    current = entry[name]
+                    if current is None or _prefer(value, current, op):
+                        entry[name] = value
+            if len(metadatas) < page_size:
+                break
+            offset += page_size
+        return list(groups.values())
+
     # ---------------- List by metadata filter ----------------
     def list_where(self, where: dict, limit: int = 1000):
         """Compatibility wrapper preferred by agentic components; delegates to get_where."""
@@ -3,10 +3,19 @@ import hashlib
 from pathlib import Path
 from app.vector_db import VectorDBClient
 
+try:  # pragma: no cover - optional fast JSON
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+def _load_json(path: str):
+    with open(path, 'rb') as f:
+        raw = f.read()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
 def clean_metadata(metadata_path: str):
     """Remove duplicate and unnecessary steps from metadata.json"""
-    with open(metadata_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = _load_json(metadata_path)
     
     actions = data.get('actions', [])
     cleaned_actions = []
@@ -37,15 +46,18 @@ def clean_metadata(metadata_path: str):
     data['totalActions'] = len(cleaned_actions)
     
     # Save cleaned metadata
-    with open(metadata_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    if orjson is not None:
+        with open(metadata_path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(metadata_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
     
     return data
 
 def ingest_to_vector_db(metadata_path: str, flow_id: str):
     """Ingest cleaned metadata into vector database"""
-    with open(metadata_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = _load_json(metadata_path)
     
     client = VectorDBClient(path="./vector_store")
     
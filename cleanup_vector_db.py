@@ -5,6 +5,9 @@ This fixes the issue where deletion was failing due to ChromaDB multi-field filt
 from app.vector_db import VectorDBClient
 import os
 
+# Ids per collection.delete call; keeps each request/SQL statement bounded
+DELETE_BATCH_SIZE = 1000
+
 def cleanup_all_flows():
     """Delete all recorder_refined flows from vector DB."""
     vdb = VectorDBClient(path=os.getenv("VECTOR_DB_PATH", "./vector_store"))
@@ -25,17 +28,18 @@ def cleanup_all_flows():
     for flow_slug, docs in sorted(flows.items()):
         print(f"  {flow_slug}: {len(docs)} documents")
     
-    # Delete each flow using correct $and syntax
+    # list_where already returned every id; delete them in bulk instead of
+    # one metadata-filtered delete per flow
+    ids = [doc['id'] for docs in flows.values() for doc in docs]
     total_deleted = 0
-    for flow_slug in flows.keys():
+    for start in range(0, len(ids), DELETE_BATCH_SIZE):
+        batch = ids[start:start + DELETE_BATCH_SIZE]
         try:
-            # Use $and operator for multi-field filter
-            vdb.collection.delete(where={"$and": [{"flow_slug": flow_slug}, {"type": "recorder_refined"}]})
-            deleted_count = len(flows[flow_slug])
-            total_deleted += deleted_count
-            print(f"✓ Deleted {flow_slug}: {deleted_count} documents")
+            vdb.collection.delete(ids=batch)
+            total_deleted += len(batch)
+            print(f"✓ Deleted {len(batch)} documents")
         except Exception as e:
-            print(f"✗ Failed to delete {flow_slug}: {e}")
+            print(f"✗ Failed to delete {len(batch)} documents: {e}")
     
     # Also clear hashstore for clean re-ingestion
     try:
@@ -24,7 +24,9 @@ def analyze_flows():
     disk_flows = {}
     
     if generated_flows_dir.exists():
-        for json_file in generated_flows_dir.glob("*.refined.json"):
+        with os.scandir(generated_flows_dir) as entries:
+            refined_files = [Path(entry.path) for entry in entries if entry.name.endswith(".refined.json")]
+        for json_file in refined_files:
             # Extract flow_slug from filename
             # Format: <name>-<flow_slug>.refined.json
             parts = json_file.stem.replace(".refined", "").split("-")
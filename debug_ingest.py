@@ -2,9 +2,15 @@ import json
 from pathlib import Path
 from app.ingest_refined_flow import _slugify, _looks_like_css_noise
 
+try:  # pragma: no cover - optional fast JSON
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
 file_path = "app/generated_flows/invoice-creation-invoice_creation.refined.json"
 p = Path(file_path)
-data = json.loads(p.read_text(encoding="utf-8"))
+raw = p.read_bytes()
+data = orjson.loads(raw) if orjson is not None else json.loads(raw)
 steps = data.get("steps") or []
 flow_name = "invoice_creation"
 flow_slug = _slugify(flow_name)
@@ -0,0 +1,55 @@
+"""Test incremental parsing of `playwright codegen` output in app.run_codegen_recorder."""
+from app.run_codegen_recorder import _ActionScanner
+
+TRANSCRIPT = b"""import re
+from playwright.sync_api import Page, expect
+
+
+def test_example(page: Page) -> None:
+    page.goto("https://example.com/login")
+    page.get_by_label("Username").click()
+    page.fill("#username", "demo")
+    page.get_by_placeholder('Password').fill("secret")
+    page.get_by_role("button", name="Sign in").click()
+    page.click("text=Dashboard")
+    page.get_by_text("Welcome").click()
+"""
+
+EXPECTED = [
+    ("navigate", 'page.goto("https://example.com/login")'),
+    ("byLabel", 'page.get_by_label("Username")'),
+    ("fill", 'page.fill("#username", "demo")'),
+    ("byPlaceholder", "page.get_by_placeholder('Password')"),
+    ("byRole", 'page.get_by_role("button", name="Sign in")'),
+    ("click", 'page.click("text=Dashboard")'),
+    ("byText", 'page.get_by_text("Welcome")'),
+]
+
+
+def _parse(chunks):
+    actions = []
+    scanner = _ActionScanner(actions)
+    for chunk in chunks:
+        scanner.feed(chunk)
+    scanner.finish()
+    return [(a["action"], a["selector"]) for a in actions]
+
+
+def test_actions_parsed_in_source_order():
+    assert _parse([TRANSCRIPT]) == EXPECTED
+
+
+def test_line_split_across_chunks_parsed_once():
+    split = TRANSCRIPT.index(b"Sign in") + 3
+    assert _parse([TRANSCRIPT[:split], TRANSCRIPT[split:]]) == EXPECTED
+    # Byte-at-a-time delivery yields the same actions, each exactly once
+    assert _parse([TRANSCRIPT[i:i + 1] for i in range(len(TRANSCRIPT))]) == EXPECTED
+
+
+def test_unterminated_last_line_parsed_on_finish():
+    actions = []
+    scanner = _ActionScanner(actions)
+    scanner.feed(b'    page.goto("https://example.com")')
+    assert actions == []
+    scanner.finish()
+    assert [a["action"] for a in actions] == ["navigate"]
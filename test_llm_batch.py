@@ -0,0 +1,52 @@
+"""Test bounded concurrency and 429 retries of llm_client.ainvoke_many."""
+import asyncio
+
+from app import llm_client
+
+
+class RateLimited(Exception):
+    status_code = 429
+
+
+class StubLLM:
+    def __init__(self, fail_first=()):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.calls = []
+        self.fail_first = set(fail_first)
+
+    async def ainvoke(self, prompt):
+        self.calls.append(prompt)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            if prompt in self.fail_first:
+                self.fail_first.discard(prompt)
+                raise RateLimited()
+            return f"out:{prompt}"
+        finally:
+            self.in_flight -= 1
+
+
+def test_ainvoke_many_bounds_in_flight_calls(monkeypatch):
+    stub = StubLLM()
+    monkeypatch.setattr(llm_client, "_ensure_llm", lambda: stub)
+
+    prompts = [f"p{i}" for i in range(10)]
+    results = asyncio.run(llm_client.ainvoke_many(prompts, max_concurrency=3))
+
+    assert results == [f"out:{p}" for p in prompts]
+    assert stub.max_in_flight == 3
+
+
+def test_ainvoke_many_retries_rate_limited_calls(monkeypatch):
+    stub = StubLLM(fail_first={"p1"})
+    monkeypatch.setattr(llm_client, "_ensure_llm", lambda: stub)
+    monkeypatch.setattr(llm_client.random, "uniform", lambda a, b: 0)
+
+    results = asyncio.run(llm_client.ainvoke_many(["p0", "p1", "p2"], max_concurrency=2))
+
+    assert results == ["out:p0", "out:p1", "out:p2"]
+    assert stub.calls.count("p1") == 2
+    assert stub.max_in_flight <= 2
@@ -0,0 +1,57 @@
+"""Unit tests for recorder action conversion helpers in app.recorder_auto_ingest."""
+from app.recorder_auto_ingest import (
+    _convert_action,
+    _first_non_empty,
+    _first_nonempty_str,
+    build_refined_flow_from_metadata,
+)
+
+
+def _click(element):
+    return {"type": "click", "element": {"selector": {"css": "#field"}, **element}}
+
+
+def test_first_nonempty_str_matches_general_version_for_numbers():
+    for values in [(0, "x"), (0.0, "x"), ("", 0), (None, 12), ("  ", ["a", "b"]), (None, " y ")]:
+        assert _first_nonempty_str(*values) == _first_non_empty(*values)
+
+
+def test_convert_action_keeps_numeric_name():
+    converted = _convert_action(_click({"name": 0, "ariaLabel": "Quantity"}))
+    assert converted.locators["name"] == "0"
+
+    converted = _convert_action(_click({"name": None, "ariaLabel": 42}))
+    assert converted.locators["name"] == "42"
+
+
+def _step_order(actions):
+    refined = build_refined_flow_from_metadata({"actions": actions}, flow_name="Order")
+    return [step["locators"]["css"] for step in refined["steps"]]
+
+
+def _timed_click(n, **timestamps):
+    return {"type": "click", "element": {"selector": {"css": f"#b{n}"}}, **timestamps}
+
+
+def test_actions_sorted_numerically_across_timestamp_formats():
+    actions = [
+        _timed_click(1, timestamp="2025-01-01T00:00:03Z"),
+        _timed_click(2, timestampEpochMs=1735689601000),
+        _timed_click(3, receivedAt="2025-01-01T00:00:02+00:00"),
+        _timed_click(4, timestamp="1735689600000"),
+        # Epoch of a different width must not sort as a string
+        _timed_click(5, timestampEpochMs=999),
+    ]
+    assert _step_order(actions) == ["#b5", "#b4", "#b2", "#b3", "#b1"]
+
+
+def test_malformed_timestamp_sorts_after_parseable_actions():
+    actions = [
+        _timed_click(1, timestamp="2025-01-01T00:00:02Z"),
+        _timed_click(2, timestamp="not-a-date"),
+        _timed_click(3, timestamp="2025-01-01T00:00:01Z"),
+        # Unparseable timestamp falls through to receivedAt
+        _timed_click(4, timestamp="garbage", receivedAt="2025-01-01T00:00:00Z"),
+        _timed_click(5),
+    ]
+    assert _step_order(actions) == ["#b4", "#b3", "#b1", "#b2", "#b5"]
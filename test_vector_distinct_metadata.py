@@ -0,0 +1,45 @@
+"""Test VectorDBClient.distinct_metadata grouping over paged metadata reads."""
+from app.vector_db import VectorDBClient
+
+
+class FakeCollection:
+    def __init__(self, metadatas):
+        self.metadatas = metadatas
+        self.includes = set()
+
+    def get(self, where, include, limit, offset):
+        self.includes.update(include)
+        return {"metadatas": self.metadatas[offset:offset + limit]}
+
+
+def _client(metadatas):
+    client = VectorDBClient.__new__(VectorDBClient)
+    client.collection = FakeCollection(metadatas)
+    return client
+
+
+def test_distinct_metadata_pages_through_every_document():
+    metadatas = [
+        {"flow_slug": "login", "flow_name": "Login", "timestamp": f"2025-01-01T00:00:{i % 60:02d}Z"}
+        for i in range(1500)
+    ] + [{"flow_slug": "invoice", "flow_name": "Invoice"}, {"flow_slug": None}]
+    client = _client(metadatas)
+
+    groups = client.distinct_metadata({"type": "recorder_refined"}, keys=("flow_slug", "flow_name"), page_size=200)
+
+    assert groups == [
+        {"flow_slug": "login", "flow_name": "Login", "count": 1500, "latest": "2025-01-01T00:00:59Z"},
+        {"flow_slug": "invoice", "flow_name": "Invoice", "count": 1, "latest": None},
+    ]
+    assert client.collection.includes == {"metadatas"}
+
+
+def test_distinct_metadata_custom_aggregates():
+    client = _client([{"flow_slug": "a", "step": 3}, {"flow_slug": "a", "step": 1}, {"flow_slug": "b", "step": 2}])
+
+    groups = client.distinct_metadata({}, aggregates={"steps": "*", "first": "min(step)", "last": "max(step)"})
+
+    assert groups == [
+        {"flow_slug": "a", "steps": 2, "first": 1, "last": 3},
+        {"flow_slug": "b", "steps": 1, "first": 2, "last": 2},
+    ]
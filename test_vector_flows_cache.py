@@ -0,0 +1,61 @@
+"""Test ETag revalidation and invalidation of the /vector/flows listing."""
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app import vector_db
+from app.api.routers import vector
+
+
+def _client(monkeypatch, flows):
+    calls = []
+
+    def fake_compute(where):
+        calls.append(where)
+        return vector.FlowListResponse(flows=[vector.FlowListItem(**f) for f in flows])
+
+    monkeypatch.setattr(vector, "_compute_flow_list", fake_compute)
+    monkeypatch.setattr(vector_db, "store_version", lambda path: (1, 1, 0, 0))
+    vector.invalidate_caches()
+    app = FastAPI()
+    app.include_router(vector.router)
+    return TestClient(app), calls
+
+
+def test_flows_etag_returns_304_when_unchanged(monkeypatch):
+    client, calls = _client(monkeypatch, [{"flowName": "Login", "flowSlug": "login", "stepCount": 3}])
+
+    first = client.get("/vector/flows")
+    assert first.status_code == 200
+    assert first.json()["flows"][0]["flowSlug"] == "login"
+    etag = first.headers["etag"]
+    assert first.headers["cache-control"] == "no-cache"
+
+    second = client.get("/vector/flows", headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.headers["etag"] == etag
+    assert len(calls) == 1
+
+
+def test_flows_cache_dropped_when_store_changes(monkeypatch):
+    flows = [{"flowName": "Login", "flowSlug": "login", "stepCount": 3}]
+    client, calls = _client(monkeypatch, flows)
+    etag = client.get("/vector/flows").headers["etag"]
+
+    # A new flow lands in the store (e.g. ingested by a worker process)
+    flows.append({"flowName": "Invoice", "flowSlug": "invoice", "stepCount": 7})
+    monkeypatch.setattr(vector_db, "store_version", lambda path: (2, 2, 0, 0))
+
+    refreshed = client.get("/vector/flows", headers={"If-None-Match": etag})
+    assert refreshed.status_code == 200
+    assert refreshed.headers["etag"] != etag
+    assert [f["flowSlug"] for f in refreshed.json()["flows"]] == ["login", "invoice"]
+    assert len(calls) == 2
+
+
+def test_invalidate_caches_forces_recompute(monkeypatch):
+    client, calls = _client(monkeypatch, [])
+    client.get("/vector/flows")
+    client.get("/vector/flows")
+    vector.invalidate_caches()
+    client.get("/vector/flows")
+    assert len(calls) == 2